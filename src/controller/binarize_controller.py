@@ -21,7 +21,9 @@
 from PyQt5.QtCore import QObject, QThread, pyqtSignal
 import cv2, numpy as np
 
+from helper.latest_value_channel import LatestValueChannel
 from model.model import DataModel
+from model.threshold_engine import ThresholdEngine
 from views.binarize_view import BinarizeView
 
 class BinarizeController(QObject):
@@ -48,12 +50,18 @@ class BinarizeController(QObject):
         self.showRefFlag = False
         self.channelMode = False
         self.readAdditionalSlider = False
+        #additional ranges kept from channel 1: (lower, upper, include)
+        self.additionalRanges = []
+        #slider drags are coalesced, the preview follows with at most 100 ms delay
+        self.parameterChannel = LatestValueChannel(debounce=0.03, maxDelay=0.1)
 
         self.image = self.model.equalizeHistory(self.model.originalImage)
 
         self.view.sliderChanged_Signal.connect(self.readSlider)
         self.view.toggleRefImage_Signal.connect(self.showRefImage)
         self.view.toggleChannelMode_Signal.connect(self.toggleChannelMode)
+        self.view.addRange_Signal.connect(self.addRange)
+        self.view.clearRanges_Signal.connect(self.clearRanges)
 
         self.showOrHideChannel2Slider()
 
@@ -78,6 +86,7 @@ class BinarizeController(QObject):
         """
         self.view.distance_dummy.setVisible(self.channelMode)
         self.view.colorChannel_label2.setVisible(self.channelMode)
+        self.view.exclude_checkbox2.setVisible(self.channelMode)
 
         self.view.hue_min_label2.setVisible(self.channelMode)
         self.view.hue_min_slider2.setVisible(self.channelMode)
@@ -120,6 +129,54 @@ class BinarizeController(QObject):
             self.view.hsv_min_label2.setText(f'HSV-CHannel 2 - lower Threshold = ({self.hMin2}, {self.sMin2}, {self.vMin2})')
             self.view.hsv_max_label2.setText(f'HSV-Channel 2 - upper Threshold = ({self.hMax2}, {self.sMax2}, {self.vMax2})')
             self.readAdditionalSlider = True
+        self.publishParameters()
+
+    def publishParameters(self):
+        """sends a snapshot of the thresholds and flags to the worker thread, an older snapshot not processed yet is dropped
+        """
+        parameters = {
+            'ranges': self.getRanges(),
+            'showRef': self.showRefFlag
+        }
+        self.parameterChannel.put(parameters)
+
+    def getRanges(self):
+        """returns the list of all HSV ranges: channel 1, the additional ranges and channel 2 in channel mode
+
+        Returns:
+            list: tuples (lower, upper, include) with lower and upper bounds of H, S and V
+        """
+        ranges = [((self.hMin1, self.sMin1, self.vMin1), (self.hMax1, self.sMax1, self.vMax1), not self.view.exclude_checkbox1.isChecked())]
+        ranges += self.additionalRanges
+        if self.channelMode and self.readAdditionalSlider:
+            ranges.append(((self.hMin2, self.sMin2, self.vMin2), (self.hMax2, self.sMax2, self.vMax2), not self.view.exclude_checkbox2.isChecked()))
+        return ranges
+
+    def addRange(self):
+        """keeps the current range of channel 1 as additional range
+        """
+        self.additionalRanges.append(self.getRanges()[0])
+        self.updateRangesLabel()
+        self.publishParameters()
+
+    def clearRanges(self):
+        """removes all additional ranges
+        """
+        self.additionalRanges = []
+        self.updateRangesLabel()
+        self.publishParameters()
+
+    def updateRangesLabel(self):
+        """lists the additional ranges in the view
+        """
+        if len(self.additionalRanges) == 0:
+            self.view.ranges_label.setText('Additional ranges: none')
+            return
+        text = 'Additional ranges:'
+        for lower, upper, include in self.additionalRanges:
+            mode = 'include' if include else 'exclude'
+            text += f'\n{mode} {lower} - {upper}'
+        self.view.ranges_label.setText(text)
 
     def updateImage(self):
         """starts a thread to update the image in the view
@@ -136,21 +193,35 @@ class BinarizeController(QObject):
         self.view.closeView_Signal.connect(self.finishThread)
         self.worker.finished.connect(self.grabImage)
         self.worker.window_toggle.connect(self.changeText)
+        self.worker.progress.connect(self.showProgress)
 
         self.worker.setImage(self.image)
+        self.worker.setPreviewImage(*self.model.createPreviewImage(self.image))
         self.worker.setMorphMode(self.model.morphMode)
+        self.worker.setParameterChannel(self.parameterChannel)
+        self.publishParameters()
         self.thread.start()
     
     def finishThread(self):
-        """finishes the worker thread by activating a stop flag
+        """finishes the worker thread by activating a stop flag and closing the parameter channel
         """
         self.threadStopFlag = True
+        self.parameterChannel.close()
+
+    def showProgress(self, value):
+        """shows the progress of applying the thresholds to the full resolution image
+
+        Args:
+            value (int): progress in percent
+        """
+        self.view.close_button.setEnabled(False)
+        self.view.close_button.setText(f'Applying thresholds... {value}%')
 
     def grabImage(self):
         """gets the image from the worker thread and saves it in model
         """
         image = self.worker.getImage()
-        if image.any():
+        if image is not None and image.any():
             self.binState = True
             self.model.binarizedImage = image
         else:
@@ -173,12 +244,14 @@ class BinarizeController(QObject):
         """sets a flag to tell the worker thread to show the reference image or close it
         """
         self.showRefFlag = not self.showRefFlag
+        self.publishParameters()
 
     def toggleChannelMode(self):
         """sets a flag to tell the worker thread to toggle channel mode
         """
         self.channelMode = not self.channelMode
         self.showOrHideChannel2Slider()
+        self.publishParameters()
 
     def changeText(self):
         """toggles the text on the hsv reference image button in the view 
@@ -194,6 +267,7 @@ class Worker(QObject):
     """
     finished = pyqtSignal()
     window_toggle = pyqtSignal()    
+    progress = pyqtSignal(int)
 
     def setMorphMode(self, mode):
         """sets the modus for the morphology operation
@@ -211,6 +285,16 @@ class Worker(QObject):
         """
         self.image = image
 
+    def setPreviewImage(self, image, factor):
+        """sets the reduced image the thresholds are previewed on
+
+        Args:
+            image (ndarray): reduced image as NumPy ndarray
+            factor (int): factor between the size of the image and the reduced image
+        """
+        self.previewImage = image
+        self.previewFactor = factor
+
     def getImage(self):
         """returns the binarized image
 
@@ -227,103 +311,128 @@ class Worker(QObject):
         """
         self.parentObject = parentObject
 
+    def setParameterChannel(self, channel: LatestValueChannel):
+        """sets the channel the thresholds are received from
+
+        Args:
+            channel (LatestValueChannel): channel with the newest parameter snapshot of the parent object
+        """
+        self.channel = channel
+
+    def _applyMorphology(self, mask, kernel):
+        """applies the selected morphology operation to a mask
+
+        Args:
+            mask (ndarray): binary mask as NumPy ndarray
+            kernel (ndarray): structuring element
+
+        Returns:
+            ndarray: mask after the morphology operation
+        """
+        if self.morphMode == 1:
+            mask = cv2.dilate(mask, kernel, iterations=1)
+        elif self.morphMode == 2:
+            mask = cv2.erode(mask, kernel, iterations=1)
+        elif self.morphMode == 3:
+            mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)
+        elif self.morphMode == 4:
+            mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)
+        return mask
+
     def run(self):
         """creates an openCV window for showing the image that needs to be binarized,
-        in loop gets the threshold values from parent object, applies them and generates a binary mask of the image
-        and shows it
-        while parentObject doesnt set a stop flag
+        waits for new thresholds from the parameter channel, applies them to the reduced preview image and shows it.
+        nothing is calculated while the thresholds do not change, the loop ends when the parent object closes the channel.
+        the last thresholds are applied to the full resolution image once to generate the binary mask
         """
         cv2.namedWindow('masked image', cv2.WINDOW_NORMAL)
-        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5,5))
+        #the kernel covers the same area of the object in the preview
+        previewKernelSize = max(1, int(5 / self.previewFactor) | 1)
+        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (previewKernelSize, previewKernelSize))
 
         self.ref_image = self.parentObject.getHSVRefImage()
         self.ref_active = False
-        self.combinedMask = None
-        self.threshold2Ready = False
-        self.combinedMaskReady = False
+        lastParameters = None
 
         #cv2.medianBlur(self.image, 3)  Bereits mit model.equalizeHistory() erfolgt
-        hsv_img = cv2.cvtColor(self.image, cv2.COLOR_BGR2HSV)
-
-        while not self.parentObject.threadStopFlag:
-            hMin1 = self.parentObject.hMin1
-            sMin1 = self.parentObject.sMin1
-            vMin1 = self.parentObject.vMin1
-            hMax1 = self.parentObject.hMax1
-            sMax1 = self.parentObject.sMax1
-            vMax1 = self.parentObject.vMax1
-            lowerThreshold1 = np.array([hMin1, sMin1, vMin1])
-            upperThreshold1 = np.array([hMax1, sMax1, vMax1])
-
-            if (self.parentObject.channelMode and self.parentObject.readAdditionalSlider) == True:
-                hMin2 = self.parentObject.hMin2
-                sMin2 = self.parentObject.sMin2
-                vMin2 = self.parentObject.vMin2
-                hMax2 = self.parentObject.hMax2
-                sMax2 = self.parentObject.sMax2
-                vMax2 = self.parentObject.vMax2
-                lowerThreshold2 = np.array([hMin2, sMin2, vMin2])
-                upperThreshold2 = np.array([hMax2, sMax2, vMax2])
-                self.threshold2Ready = True
-            
-            self.mask1 = cv2.inRange(hsv_img, lowerThreshold1, upperThreshold1)
-
-            if self.morphMode == 1:
-                self.mask1 = cv2.dilate(self.mask1, kernel, iterations=1)
-            elif self.morphMode == 2:
-                self.mask1 = cv2.erode(self.mask1, kernel, iterations=1)
-            elif self.morphMode == 3:
-                self.mask1 = cv2.morphologyEx(self.mask1, cv2.MORPH_OPEN, kernel)
-            elif self.morphMode == 4:
-                self.mask1 = cv2.morphologyEx(self.mask1, cv2.MORPH_CLOSE, kernel)
-
-            if (self.parentObject.channelMode and self.parentObject.readAdditionalSlider and self.threshold2Ready) == True:
-                self.mask2 = cv2.inRange(hsv_img, lowerThreshold2, upperThreshold2)
-
-                if self.morphMode == 1:
-                    self.mask2 = cv2.dilate(self.mask2, kernel, iterations=1)
-                elif self.morphMode == 2:
-                    self.mask2 = cv2.erode(self.mask2, kernel, iterations=1)
-                elif self.morphMode == 3:
-                    self.mask2 = cv2.morphologyEx(self.mask2, cv2.MORPH_OPEN, kernel)
-                elif self.morphMode == 4:
-                    self.mask2 = cv2.morphologyEx(self.mask2, cv2.MORPH_CLOSE, kernel)
-                
-                self.combinedMask = cv2.bitwise_or(self.mask1, self.mask2)
-
-                self.combinedMaskReady = True
-
-            if (self.parentObject.channelMode and self.parentObject.readAdditionalSlider and self.combinedMaskReady) == True:
-                result = cv2.bitwise_and(self.image, self.image, mask=self.combinedMask)
-            else:
-                result = cv2.bitwise_and(self.image, self.image, mask=self.mask1)
-
-            cv2.imshow('masked image', result)
-            if cv2.waitKey(50) & 0xFF == ord('q'):
+        hsv_img = cv2.cvtColor(self.previewImage, cv2.COLOR_BGR2HSV)
+        thresholdEngine = ThresholdEngine(hsv_img)
+
+        while True:
+            #blocks until new thresholds arrive, the timeout keeps the openCV windows responsive
+            parameters = self.channel.get(timeout=0.05)
+            if parameters is not None:
+                lastParameters = parameters
+                mask = self._createMask(thresholdEngine, parameters, kernel)
+                result = cv2.bitwise_and(self.previewImage, self.previewImage, mask=mask)
+                cv2.imshow('masked image', result)
+                self._updateRefWindow(parameters['showRef'])
+            elif self.channel.isClosed():
                 break
 
-            if self.parentObject.showRefFlag:
-                if self.ref_active:
-                    pass
-                else:
-                    self.ref_active = True
-                    self.window_toggle.emit()
-                cv2.namedWindow('HSV Reference')
-                cv2.imshow('HSV Reference', self.ref_image)
-            else:
-                if not self.ref_active:
-                    pass
-                else:
-                    self.ref_active = False
-                    self.window_toggle.emit()
-                if cv2.getWindowProperty('HSV Reference', cv2.WND_PROP_VISIBLE) >= 1:
-                    cv2.destroyWindow('HSV Reference')
-                    
-        if self.parentObject.channelMode == True and self.combinedMask.any():
-            self.binaryImage = cv2.threshold(self.combinedMask, 120, 255, cv2.THRESH_BINARY)[1]
-        else:
-            self.binaryImage = cv2.threshold(self.mask1, 120, 255, cv2.THRESH_BINARY)[1]
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                break
 
         cv2.destroyAllWindows()
 
-        self.finished.emit()
\ No newline at end of file
+        self.binaryImage = self._createFullResolutionMask(lastParameters)
+
+        self.finished.emit()
+
+    def _createMask(self, thresholdEngine, parameters, kernel, reportProgress=False):
+        """applies all ranges in one pass and the morphology operation once to the combined mask
+
+        Args:
+            thresholdEngine (ThresholdEngine): engine with the planes of the image
+            parameters (dict): snapshot of the thresholds
+            kernel (ndarray): structuring element
+            reportProgress (bool, optional): emit the progress signal. Defaults to False.
+
+        Returns:
+            ndarray: mask as uint8 NumPy ndarray
+        """
+        mask = thresholdEngine.getMask(parameters['ranges'])
+        if reportProgress:
+            self.progress.emit(75)
+        return self._applyMorphology(mask, kernel)
+
+    def _createFullResolutionMask(self, parameters):
+        """applies the thresholds to the full resolution image and reports the progress
+
+        Args:
+            parameters (dict): snapshot of the thresholds
+
+        Returns:
+            ndarray: binary mask as uint8 NumPy ndarray, None if no thresholds were received
+        """
+        if parameters is None:
+            return None
+        self.progress.emit(0)
+        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5,5))
+        hsv_img = cv2.cvtColor(self.image, cv2.COLOR_BGR2HSV)
+        self.progress.emit(25)
+        thresholdEngine = ThresholdEngine(hsv_img)
+        self.progress.emit(40)
+        mask = self._createMask(thresholdEngine, parameters, kernel, reportProgress=True)
+        binaryImage = cv2.threshold(mask, 120, 255, cv2.THRESH_BINARY)[1]
+        self.progress.emit(100)
+        return binaryImage
+
+    def _updateRefWindow(self, showRef):
+        """shows or hides the hsv reference image
+
+        Args:
+            showRef (bool): True if the reference image should be shown
+        """
+        if showRef:
+            if not self.ref_active:
+                self.ref_active = True
+                self.window_toggle.emit()
+            cv2.namedWindow('HSV Reference')
+            cv2.imshow('HSV Reference', self.ref_image)
+        else:
+            if self.ref_active:
+                self.ref_active = False
+                self.window_toggle.emit()
+            if cv2.getWindowProperty('HSV Reference', cv2.WND_PROP_VISIBLE) >= 1:
+                cv2.destroyWindow('HSV Reference')
\ No newline at end of file
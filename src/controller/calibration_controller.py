@@ -18,7 +18,12 @@
 #You should have received a copy of the GNU General Public License
 #along with this program.  If not, see <https://www.gnu.org/licenses/>
 
+import os
 from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtWidgets import QMessageBox
+import cv2
+
+from helper.custom_exceptions import MissingInputException, NoChessboardException
 
 from model.model import DataModel
 from views.calibration_view import CalibrationView
@@ -58,6 +63,7 @@ class CalibrationController(QObject):
         self.view.input_cb_square_status.setPixmap(self.status_icon_none)
         self.view.calibration_status_label.setPixmap(self.status_icon_none)
         self.view.save_status.setPixmap(self.status_icon_none)
+        self.view.add_images_status.setPixmap(self.status_icon_none)
 
         self.view.closeView_Signal.connect(self.calViewClosed)
         self.view.showGeneralInfo_Signal.connect(self.showGeneralInfoView)
@@ -68,6 +74,8 @@ class CalibrationController(QObject):
         self.view.calculateCalData_Signal.connect(self.calculateCalData)
         self.model.calibrationState_Signal.connect(self.setCalState)
         self.view.saveCalData_Signal.connect(self.saveCalData)
+        self.view.addCalImages_Signal.connect(self.addCalImages)
+        self.view.showErrorMap_Signal.connect(self.showErrorMap)
         self.view.undoChanges_Signal.connect(self.undoChanges)
 
         self.view.show()
@@ -102,6 +110,8 @@ class CalibrationController(QObject):
         """
         self.view.open_cal_dir_status.setPixmap(self.status_icon_wait)
         result = self.model.loadCalImagesFromDirectory()
+        if self.model.calibrationFiles is not None:
+            self.view.open_cal_dir_status.setToolTip(f'{len(self.model.calibrationFiles)} images found')
         if result == True:
             self.calImg = True
             self.view.open_cal_dir_status.setPixmap(self.status_icon_okay)
@@ -150,12 +160,82 @@ class CalibrationController(QObject):
         """
         self.view.calibration_status_label.setPixmap(self.status_icon_wait)
         result = self.model.calculateCalibrationData()
+        self.showDetectionResults()
         if result == True:
             self.view.calibration_status_label.setPixmap(self.status_icon_okay)
         else:
             self.view.calibration_status_label.setPixmap(self.status_icon_fail)
         self.model.setCalibrationState(result)
 
+    def addCalImages(self):
+        """calls a method that adds calibration images and solves the calibration again, handles the status
+        """
+        self.view.add_images_status.setPixmap(self.status_icon_wait)
+        try:
+            result = self.model.addCalibrationImagesFromDirectory()
+        except (MissingInputException, NoChessboardException) as e:
+            result = False
+            _ = QMessageBox.warning(self.view, 'Images not added!', 'Images could not be added to the calibration:\n' + str(e), QMessageBox.Ok, QMessageBox.Ok)
+        self.showDetectionResults()
+        if result == True:
+            self.view.add_images_status.setPixmap(self.status_icon_okay)
+        else:
+            self.view.add_images_status.setPixmap(self.status_icon_fail)
+
+    def showDetectionResults(self):
+        """shows how many chessboards were detected in the calibration images,
+        the result and duration of each image is shown as tooltip
+        """
+        results = self.model.detectionResults
+        if results is None:
+            self.view.detection_info_label.setText('')
+            return
+        found = [res for res in results if res['found']]
+        failed = [str(res['image_index']) for res in results if not res['found']]
+        totalTime = sum(res['duration'] for res in results)
+        cached = [res for res in results if res['cached']]
+        text = f'Chessboard found in {len(found)} of {len(results)} images (detection time {totalTime:.1f} s, {len(cached)} from cache)'
+        stats = self.model.calImageLoadStats
+        if stats is not None:
+            text += f'\nDecode time {stats["decode_time"]:.1f} s'
+            if stats['peak_memory'] is not None:
+                text += f', peak memory {stats["peak_memory"] / (1024 * 1024):.0f} MB'
+        if len(failed) > 0:
+            text += '\nNo chessboard in image(s): ' + ', '.join(failed)
+        errors = self.model.reprojectionErrors
+        if errors is not None:
+            text += f'\nReprojection error: rms {errors["rms"]:.3f} px, max {errors["max"]:.3f} px'
+        if self.model.calibrationViews is not None:
+            rejected = [str(view['image_index']) for view in self.model.calibrationViews if view['rejected']]
+            if len(rejected) > 0:
+                text += f'\nRejected image(s) with error > {self.model.maxViewError} px: ' + ', '.join(rejected)
+        self.view.detection_info_label.setText(text)
+        lines = []
+        for res in results:
+            if res['error'] is not None:
+                state = res['error']
+            elif res['cached']:
+                state = 'found (cached)' if res['found'] else 'failed (cached)'
+            elif res['found']:
+                state = 'found'
+            else:
+                state = 'failed'
+            lines.append(f'Image {res["image_index"]} ({os.path.basename(res["file"])}): {state} ({res["duration"]*1000:.0f} ms)')
+        for engine, stats in self.model.getDetectionStats().items():
+            line = f'{engine}: {stats["attempts"]} detections, rate {stats["detection_rate"]*100:.0f} %, mean {stats["mean_time"]*1000:.0f} ms'
+            if stats['mean_time_failed'] is not None:
+                line += f', failed mean {stats["mean_time_failed"]*1000:.0f} ms'
+            lines.append(line)
+        self.view.detection_info_label.setToolTip('\n'.join(lines))
+
+    def showErrorMap(self):
+        """shows the mean reprojection error per sensor region in a window
+        """
+        image = self.model.createErrorHeatmapImage()
+        cv2.imshow('Reprojection error [px]', image)
+        cv2.waitKey(0)
+        cv2.destroyAllWindows()
+
     def setCalState(self, state):
         """sets the calibration status in the view and main view
 
@@ -165,6 +245,8 @@ class CalibrationController(QObject):
         self.view.calState = state
         self.calState = state
         self.view.save_button.setEnabled(state)
+        self.view.add_images_button.setEnabled(state)
+        self.view.error_map_button.setEnabled(state and self.model.reprojectionErrors is not None)
 
     def saveCalData(self):
         """calls a method for saving the calibration data, handles save status
@@ -97,7 +97,7 @@ class CenterController(QObject):
         """
         state = False
         if (self.imageCenterX and self.imageCenterY) != 0:
-            middlepoint = (self.imageCenterX + self.offsetH, self.imageCenterY + self.offsetV)
+            middlepoint = self.model.undistortImagePoint((self.imageCenterX + self.offsetH, self.imageCenterY + self.offsetV))
             reply = QMessageBox.question(self.view,
                 'Acceptable result?',
                 'Does the result seem to be acceptable?\nElse try to set another reference point later.',
@@ -223,9 +223,14 @@ class MainController(QObject):
         image = self.model.loadImagefromFile()
         if image is not None:
             self.model.originalImageSize_preCrop = image.shape
-            croppedObjectImage, _ = self.model.undistortAndCropImage(image=image)
-            if croppedObjectImage.any():
-                self.model.originalImageSize_afterCrop = croppedObjectImage.shape
+            if self.model.isSparseUndistortion():
+                #contour points get undistorted after contour detection
+                croppedObjectImage = image
+                croppedShape = self.model.getUndistortedImageShape(image)
+            else:
+                croppedObjectImage, croppedShape = self.model.undistortAndCropImage(image=image)
+            if croppedObjectImage is not None and croppedObjectImage.any():
+                self.model.originalImageSize_afterCrop = croppedShape
                 self.model.originalImage = croppedObjectImage
                 self.model.setImageLoadState(True)
                 
@@ -22,6 +22,7 @@ from PyQt5.QtWidgets import QMessageBox
 from PyQt5.QtCore import QObject, pyqtSignal
 
 from model.model import DataModel
+from helper.custom_exceptions import MissingInputException
 from views.process_view import ProcessView
 from controller.binarize_controller import BinarizeController
 from views.binarize_view import BinarizeView
@@ -60,6 +61,7 @@ class ProcessController(QObject):
 
         self.view.openBinaryView_Signal.connect(self.showBinaryView)
         self.view.findContours_Signal.connect(self.findContours)
+        self.view.checkAccuracy_Signal.connect(self.checkUndistortionAccuracy)
         self.view.findCenter_Signal.connect(self.findCenter)
         self.view.setReference_Signal.connect(self.setReference)
         self.model.contoursState_Signal.connect(self.setContoursState)
@@ -110,6 +112,26 @@ class ProcessController(QObject):
             self.view.setOrigin_button.setEnabled(True)
         else:
             self.view.contoursState_label.setPixmap(self.status_icon_fail)
+        self.view.accuracy_button.setEnabled(state == True and self.model.isSparseUndistortion())
+        self.view.accuracy_label.setText('')
+
+    def checkUndistortionAccuracy(self):
+        """compares the contours of the sparse undistortion mode with the contours of a fully undistorted image,
+        the result is shown below the contours
+        """
+        try:
+            comparison = self.model.compareSparseUndistortion()
+        except MissingInputException as e:
+            comparison = None
+        if comparison is None or comparison['contours'] == 0:
+            text = 'No contours to compare with the undistortion of the whole image'
+        else:
+            text = (f'Sparse undistortion compared to full image undistortion ({comparison["contours"]} contours, {comparison["unmatched"]} without partner):\n'
+                f'center offset mean/max: {comparison["mean_center_offset_px"]:.2f}/{comparison["max_center_offset_px"]:.2f} px\n'
+                f'area difference mean/max: {comparison["mean_area_difference"]:.2%}/{comparison["max_area_difference"]:.2%}')
+            if comparison['max_center_offset_px'] > 1:
+                text += '\nConsider undistorting the whole image.'
+        self.view.accuracy_label.setText(text)
 
     def findCenter(self):
         """tries to find the center of an image
@@ -50,7 +50,7 @@ class ReferenceController(QObject):
         if self.model.threeChannelGrayImage is not None:
             image = copy.copy(self.model.threeChannelGrayImage)
         else:
-            temp = copy.copy(self.model.originalImage)
+            temp = copy.copy(self.model.getObjectImageForDrawing())
             grayTemp = cv2.cvtColor(temp, cv2.COLOR_BGR2GRAY)
             image = cv2.merge((grayTemp, grayTemp, grayTemp))
             self.model.threeChannelGrayImage = copy.copy(image)
@@ -68,6 +68,16 @@ class SettingController(QObject):
         self.view.morphSelect_Signal.connect(self.setMorphOption)
 
         self.view.morph_combobox.setCurrentIndex(self.model.morphMode)
+        self.view.undistort_combobox.addItems(self.model.undistort_options)
+        self.view.undistort_combobox.setCurrentIndex(self.model.undistortMode)
+        self.view.undistortSelect_Signal.connect(self.setUndistortOption)
+        self.view.engine_combobox.addItems(self.model.chessboard_engine_options)
+        self.view.engine_combobox.setCurrentIndex(self.model.chessboardEngine)
+        self.view.engineSelect_Signal.connect(self.setEngineOption)
+        self.view.prefilter_checkbox.setChecked(self.model.contourPrefilter)
+        self.view.togglePrefilter_Signal.connect(self.setPrefilterState)
+        self.view.ring_input.setText(str(self.model.maxRingWidth))
+        self.view.maxRingWidth_Signal.connect(self.setMaxRingWidth)
 
         self.view.show()
 
@@ -92,6 +102,9 @@ class SettingController(QObject):
         if isinstance(scale, float):
             if scale > 0.0 and scale <= 1.0:
                 self.model.scaleFactor = scale
+                if self.model.calibrationState and not self.model.applyCalibrationScale(scale):
+                    QMessageBox.warning(self.view, 'Warning', 'The calibration can not be scaled, the size of its calibration images is unknown.\n'
+                        'Please load or calculate the calibration again!', QMessageBox.Ok)
             else:
                 self.showNoValidInput()
         else:
@@ -144,6 +157,25 @@ class SettingController(QObject):
         state = self.view.startup_checkbox.isChecked()
         self.model.showNewInfoAtStartup = state
 
+    def setPrefilterState(self):
+        """toggles the removal of interference before finding contours
+        """
+        state = self.view.prefilter_checkbox.isChecked()
+        self.model.contourPrefilter = state
+
+    def setMaxRingWidth(self):
+        """sets a new maximum width of rings whose inner edge is removed as duplicate
+        """
+        try:
+            width = float(self.view.ring_input.text())
+        except ValueError as e:
+            self.showNoValidInput()
+            return
+        if width >= 0.0:
+            self.model.maxRingWidth = width
+        else:
+            self.showNoValidInput()
+
     def setMorphOption(self, listItem):
         if listItem == '':
             pass
@@ -158,6 +190,24 @@ class SettingController(QObject):
         else:
             self.model.morphMode = 1#default
 
+    def setUndistortOption(self, index):
+        """sets the method for undistorting images
+
+        Args:
+            index (int): index of the selected method in the models undistort options
+        """
+        if index >= 0 and index < len(self.model.undistort_options):
+            self.model.undistortMode = index
+
+    def setEngineOption(self, index):
+        """sets the method for detecting chessboards
+
+        Args:
+            index (int): index of the selected method in the models chessboard engine options
+        """
+        if index >= 0 and index < len(self.model.chessboard_engine_options):
+            self.model.chessboardEngine = index
+
     def showNoValidInput(self):
         """shows a warning message if an input is not valid
         """
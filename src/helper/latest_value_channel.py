@@ -0,0 +1,103 @@
+#Copyright (C) 2021 Marc Sebastian Heinz
+#                   <sebastian.heinz[at]]online.de>
+#Copyright (C) 2021 AVL Schrick GmbH
+#                   Dreherstraße 3-5
+#                   42899 Remscheid
+#                   <info@avl-schrick.com>
+
+#This program is free software: you can redistribute it and/or modify
+#it under the terms of the GNU General Public License as published by
+#the Free Software Foundation, either version 3 of the License, or
+#(at your option) any later version.
+
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU General Public License for more details.
+
+#You should have received a copy of the GNU General Public License
+#along with this program.  If not, see <https://www.gnu.org/licenses/>
+
+import threading, time
+
+class LatestValueChannel():
+    """thread safe channel that only keeps the newest value.
+    values put while the reader is busy replace each other (coalescing), the reader waits until no new value
+    arrived for the debounce time, but not longer than the maximum delay so a continuous input is still shown
+    """
+
+    def __init__(self, debounce=0.0, maxDelay=None):
+        """creates an empty channel
+
+        Args:
+            debounce (float, optional): time in seconds without a new value before a value is returned. Defaults to 0.0.
+            maxDelay (float, optional): maximal time in seconds the oldest unread value is held back by debouncing. Defaults to None.
+        """
+        self.condition = threading.Condition()
+        self.debounce = debounce
+        self.maxDelay = maxDelay
+        self.value = None
+        self.version = 0
+        self.readVersion = 0
+        self.lastPutTime = 0.0
+        self.firstUnreadTime = 0.0
+        self.dropped = 0
+        self.closed = False
+
+    def put(self, value):
+        """replaces the value of the channel and wakes up the reader
+
+        Args:
+            value: new value
+        """
+        with self.condition:
+            now = time.monotonic()
+            if self.version == self.readVersion:
+                self.firstUnreadTime = now
+            else:
+                self.dropped += 1
+            self.value = value
+            self.version += 1
+            self.lastPutTime = now
+            self.condition.notify_all()
+
+    def get(self, timeout=None):
+        """waits for a value that was not read yet
+
+        Args:
+            timeout (float, optional): maximal time in seconds to wait for a new value. Defaults to None.
+
+        Returns:
+            newest value, None if there was no new value within the timeout
+        """
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.version != self.readVersion or self.closed, timeout):
+                return None
+            if self.version == self.readVersion:
+                return None
+            while not self.closed:
+                deadline = self.lastPutTime + self.debounce
+                if self.maxDelay is not None:
+                    deadline = min(deadline, self.firstUnreadTime + self.maxDelay)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.condition.wait(remaining)
+            self.readVersion = self.version
+            return self.value
+
+    def close(self):
+        """closes the channel, a waiting reader returns immediately
+        """
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def isClosed(self):
+        """returns whether the channel was closed
+
+        Returns:
+            bool: True if closed
+        """
+        with self.condition:
+            return self.closed
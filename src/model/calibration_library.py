@@ -0,0 +1,209 @@
+#Copyright (C) 2021 Marc Sebastian Heinz
+#                   <sebastian.heinz[at]]online.de>
+#Copyright (C) 2021 AVL Schrick GmbH
+#                   Dreherstraße 3-5
+#                   42899 Remscheid
+#                   <info@avl-schrick.com>
+
+#This program is free software: you can redistribute it and/or modify
+#it under the terms of the GNU General Public License as published by
+#the Free Software Foundation, either version 3 of the License, or
+#(at your option) any later version.
+
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU General Public License for more details.
+
+#You should have received a copy of the GNU General Public License
+#along with this program.  If not, see <https://www.gnu.org/licenses/>
+
+import os, json, sqlite3, threading, time, numpy as np
+
+class CalibrationLibrary():
+    """versioned store for calibration data.
+    every calibration is one entry in an SQLite index and one directory with a .npy file per array,
+    arrays are loaded memory mapped so only the used parts of large remap tables are read from disk
+    """
+
+    index_filename = 'library.db'
+    index_columns = ('id', 'owner', 'camera', 'lens', 'focal_length', 'width', 'height', 'scale', 'version', 'created', 'directory', 'meta')
+
+    def __init__(self, path):
+        """opens the library in the given directory, the directory and index are created if missing
+
+        Args:
+            path (str): directory of the library
+        """
+        self.path = path
+        os.makedirs(self.path, exist_ok=True)
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(os.path.join(self.path, self.index_filename), check_same_thread=False)
+        self.connection.execute('''CREATE TABLE IF NOT EXISTS calibrations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            owner TEXT, camera TEXT, lens TEXT, focal_length TEXT,
+            width INTEGER, height INTEGER, scale REAL, version INTEGER,
+            created REAL, directory TEXT, meta TEXT)''')
+        self.connection.execute('CREATE INDEX IF NOT EXISTS calibrations_lookup ON calibrations (camera, lens, width, height, scale)')
+        self.connection.commit()
+        self.entries = []
+        self.loadedEntries = {}
+        self._readIndex()
+
+    def _readIndex(self):
+        """reads all entries of the index into memory, queries are answered without accessing the database
+        """
+        cursor = self.connection.execute('SELECT ' + ', '.join(self.index_columns) + ' FROM calibrations ORDER BY id')
+        self.entries = [self._rowToEntry(row) for row in cursor.fetchall()]
+
+    def _rowToEntry(self, row):
+        """converts a row of the index into an entry dictionary
+
+        Args:
+            row (tuple): row with the values of index_columns
+
+        Returns:
+            dict: entry with the column names as keys, meta is decoded from json
+        """
+        entry = dict(zip(self.index_columns, row))
+        entry['meta'] = json.loads(entry['meta']) if entry['meta'] else {}
+        return entry
+
+    def save(self, owner, camera, lens, focalLength, resolution, scale, arrays, meta=None):
+        """saves a calibration as new version of the camera, lens, resolution and scale factor combination
+
+        Args:
+            owner (str): owner of the camera
+            camera (str): name of the camera
+            lens (str): name of the lens
+            focalLength (str): focal length of the lens
+            resolution (tuple): width and height of the calibration images
+            scale (float): scale factor the calibration images were loaded with
+            arrays (dict): NumPy arrays of the calibration, stored as one .npy file per key
+            meta (dict, optional): json serializable values of the calibration. Defaults to None.
+
+        Returns:
+            dict: the saved entry
+        """
+        width, height = int(resolution[0]), int(resolution[1])
+        created = time.time()
+        metaJson = json.dumps(meta or {})
+        with self.lock:
+            previous = [entry['version'] for entry in self.entries if self._matches(entry, owner, camera, lens, (width, height), scale)]
+            version = max(previous) + 1 if previous else 1
+            directory = '{}_{}_{}_{}x{}_{}_v{}'.format(owner, camera, lens, width, height, scale, version)
+            directory = ''.join(c if c.isalnum() or c in '._-' else '_' for c in directory)
+            entryPath = os.path.join(self.path, directory)
+            os.makedirs(entryPath, exist_ok=True)
+            for name, array in arrays.items():
+                if array is not None:
+                    np.save(os.path.join(entryPath, name + '.npy'), np.ascontiguousarray(array))
+            cursor = self.connection.execute('INSERT INTO calibrations (owner, camera, lens, focal_length, width, height, scale, version, created, directory, meta) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (owner, camera, lens, focalLength, width, height, float(scale), version, created, directory, metaJson))
+            self.connection.commit()
+            entry = self._rowToEntry((cursor.lastrowid, owner, camera, lens, focalLength, width, height, float(scale), version, created, directory, metaJson))
+            self.entries.append(entry)
+        return entry
+
+    def _matches(self, entry, owner=None, camera=None, lens=None, resolution=None, scale=None):
+        """checks if an entry matches all given criteria, None matches everything
+
+        Args:
+            entry (dict): entry of the index
+            owner (str, optional): owner of the camera. Defaults to None.
+            camera (str, optional): name of the camera. Defaults to None.
+            lens (str, optional): name of the lens. Defaults to None.
+            resolution (tuple, optional): width and height of the calibration images. Defaults to None.
+            scale (float, optional): scale factor. Defaults to None.
+
+        Returns:
+            bool: True if all criteria match
+        """
+        if owner is not None and entry['owner'] != owner:
+            return False
+        if camera is not None and entry['camera'] != camera:
+            return False
+        if lens is not None and entry['lens'] != lens:
+            return False
+        if resolution is not None and (entry['width'], entry['height']) != (int(resolution[0]), int(resolution[1])):
+            return False
+        if scale is not None and abs(entry['scale'] - float(scale)) > 1e-9:
+            return False
+        return True
+
+    def query(self, owner=None, camera=None, lens=None, resolution=None, scale=None, latestOnly=False):
+        """returns all entries matching the given criteria, None matches everything
+
+        Args:
+            owner (str, optional): owner of the camera. Defaults to None.
+            camera (str, optional): name of the camera. Defaults to None.
+            lens (str, optional): name of the lens. Defaults to None.
+            resolution (tuple, optional): width and height of the calibration images. Defaults to None.
+            scale (float, optional): scale factor. Defaults to None.
+            latestOnly (bool, optional): only return the newest version of every combination. Defaults to False.
+
+        Returns:
+            list: matching entries, newest first
+        """
+        result = [entry for entry in reversed(self.entries) if self._matches(entry, owner, camera, lens, resolution, scale)]
+        if latestOnly:
+            seen = set()
+            latest = []
+            for entry in result:
+                key = (entry['owner'], entry['camera'], entry['lens'], entry['width'], entry['height'], entry['scale'])
+                if key not in seen:
+                    seen.add(key)
+                    latest.append(entry)
+            result = latest
+        return result
+
+    def find(self, camera, lens, resolution, scale):
+        """returns the newest entry for a camera, lens, resolution and scale factor
+
+        Args:
+            camera (str): name of the camera
+            lens (str): name of the lens
+            resolution (tuple): width and height of the images
+            scale (float): scale factor the images are loaded with
+
+        Returns:
+            dict: newest matching entry or None
+        """
+        for entry in reversed(self.entries):
+            if self._matches(entry, camera=camera, lens=lens, resolution=resolution, scale=scale):
+                return entry
+        return None
+
+    def load(self, entryId):
+        """loads the arrays of an entry memory mapped. loaded entries are kept, loading an entry again is free
+
+        Args:
+            entryId (int): id of the entry
+
+        Returns:
+            tuple: entry and dictionary with the memory mapped arrays, None if the entry does not exist
+        """
+        if entryId in self.loadedEntries:
+            return self.loadedEntries[entryId]
+        entry = next((entry for entry in self.entries if entry['id'] == entryId), None)
+        if entry is None:
+            return None
+        entryPath = os.path.join(self.path, entry['directory'])
+        arrays = {}
+        for filename in os.listdir(entryPath):
+            name, ext = os.path.splitext(filename)
+            if ext == '.npy':
+                arrays[name] = np.load(os.path.join(entryPath, filename), mmap_mode='r')
+        self.loadedEntries[entryId] = (entry, arrays)
+        return self.loadedEntries[entryId]
+
+    def getEntryName(self, entry):
+        """returns a readable name of an entry
+
+        Args:
+            entry (dict): entry of the index
+
+        Returns:
+            str: name with camera, lens, resolution, scale factor and version
+        """
+        return '{} {} {} ({}) {}x{} scale {} v{}'.format(entry['owner'], entry['camera'], entry['lens'], entry['focal_length'], entry['width'], entry['height'], entry['scale'], entry['version'])
@@ -0,0 +1,293 @@
+#Copyright (C) 2021 Marc Sebastian Heinz
+#                   <sebastian.heinz[at]]online.de>
+#Copyright (C) 2021 AVL Schrick GmbH
+#                   Dreherstraße 3-5
+#                   42899 Remscheid
+#                   <info@avl-schrick.com>
+
+#This program is free software: you can redistribute it and/or modify
+#it under the terms of the GNU General Public License as published by
+#the Free Software Foundation, either version 3 of the License, or
+#(at your option) any later version.
+
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU General Public License for more details.
+
+#You should have received a copy of the GNU General Public License
+#along with this program.  If not, see <https://www.gnu.org/licenses/>
+
+import numpy as np
+
+class ContourTable():
+    """columnar store for the found contours.
+    every value of a contour is one entry in a NumPy column, the points of all contours are stored in one flat buffer
+    per coordinate system with an offsets index. indexing and iterating returns ContourRecord views,
+    so a contour can be used like a dictionary with the keys of the former contours list
+    """
+
+    #name: (dtype, shape of one value, empty value)
+    scalar_columns = {
+        'contour_index': (np.int32, (), 0),
+        'contour_center_px': (np.int32, (2,), 0),
+        'contour_area_px': (np.float64, (), np.nan),
+        'contour_perimeter_px': (np.float64, (), np.nan),
+        'contour_is_hole': (np.int8, (), -1),
+        'contour_parent_index': (np.int32, (), -1),
+        'contour_depth': (np.int32, (), 0),
+        'contour_is_outline': (np.bool_, (), False),
+        'center_point_ref': (np.int32, (2,), 0),
+        'center_point_ref_mm': (np.float64, (2,), np.nan),
+        'center_point_cad': (np.float64, (2,), np.nan),
+        'roundness': (np.float64, (), np.nan),
+        'diameter_px': (np.float64, (), np.nan),
+        'diameter_mm': (np.float64, (), np.nan),
+        'deviation_px': (np.float64, (), np.nan),
+        'deviation_mm': (np.float64, (), np.nan),
+        'circle_center_px': (np.float64, (2,), np.nan),
+        'circle_radius_px': (np.float64, (), np.nan),
+        'circle_residual_px': (np.float64, (), np.nan),
+        'set_diameter_manually': (np.bool_, (), False)
+    }
+    #name: (dtype, shape of a contour as returned by a record)
+    point_columns = {
+        'contour_points_px': (np.int32, (-1, 1, 2)),
+        'contour_points_ref': (np.int32, (-1, 1, 2)),
+        'contour_points_mm': (np.float64, (-1, 2)),
+        'contour_points_cad': (np.float64, (-1, 2))
+    }
+    #order of the keys like in the former contours list
+    keys = ('contour_index', 'contour_points_px', 'contour_points_ref', 'contour_points_mm', 'contour_points_cad', 'contour_center_px',
+        'contour_area_px', 'contour_perimeter_px', 'contour_is_hole', 'contour_parent_index', 'contour_depth', 'contour_is_outline', 'center_point_ref', 'center_point_ref_mm', 'center_point_cad',
+        'roundness', 'diameter_px', 'diameter_mm', 'deviation_px', 'deviation_mm', 'circle_center_px', 'circle_radius_px', 'circle_residual_px',
+        'set_diameter_manually')
+    #columns that stay None until they are calculated for all contours
+    derived_columns = ('contour_points_ref', 'contour_points_mm', 'contour_points_cad', 'center_point_ref', 'center_point_ref_mm', 'center_point_cad')
+
+    def __init__(self, points, offsets):
+        """creates a table for contours with the given points, all other columns are empty
+
+        Args:
+            points (ndarray): points of all contours as int32 NumPy ndarray with shape (n, 2)
+            offsets (ndarray): index of the first point of every contour and the number of points as last entry
+        """
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        size = len(self.offsets) - 1
+        self.points = {name: None for name in self.point_columns}
+        self.points['contour_points_px'] = np.ascontiguousarray(points, dtype=np.int32).reshape(-1, 2)
+        self.columns = {}
+        for name, (dtype, shape, empty) in self.scalar_columns.items():
+            if name in self.derived_columns:
+                self.columns[name] = None
+            else:
+                self.columns[name] = np.full((size,) + shape, empty, dtype=dtype)
+        self.columns['contour_index'][:] = np.arange(size)
+
+    @classmethod
+    def fromContours(cls, contours):
+        """creates a table from contours as returned by cv2.findContours
+
+        Args:
+            contours (list): contours as NumPy ndarrays with shape (n, 1, 2)
+
+        Returns:
+            ContourTable: table with the points of all contours
+        """
+        lengths = [len(c) for c in contours]
+        offsets = np.zeros(len(contours) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(lengths)
+        if len(contours) > 0:
+            points = np.concatenate([c.reshape(-1, 2) for c in contours])
+        else:
+            points = np.zeros((0, 2), dtype=np.int32)
+        return cls(points, offsets)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError(index)
+        return ContourRecord(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield ContourRecord(self, index)
+
+    def getLengths(self):
+        """returns the number of points of every contour
+
+        Returns:
+            ndarray: number of points per contour
+        """
+        return np.diff(self.offsets)
+
+    def getContours(self, name='contour_points_px'):
+        """returns the points of every contour as separate views of the flat buffer, e.g. for cv2.drawContours
+
+        Args:
+            name (str, optional): name of the point column. Defaults to 'contour_points_px'.
+
+        Returns:
+            list: points of every contour, None if the column was not calculated
+        """
+        if self.points[name] is None:
+            return None
+        shape = self.point_columns[name][1]
+        return [self.points[name][self.offsets[i]:self.offsets[i + 1]].reshape(shape) for i in range(len(self))]
+
+    def setPoints(self, name, points):
+        """sets the points of all contours of a point column, the points have to be ordered like the pixel coordinates
+
+        Args:
+            name (str): name of the point column
+            points (ndarray): points of all contours with shape (n, 2)
+        """
+        dtype = self.point_columns[name][0]
+        points = np.ascontiguousarray(points, dtype=dtype).reshape(-1, 2)
+        if len(points) != self.offsets[-1]:
+            raise ValueError('number of points does not match the contours')
+        self.points[name] = points
+
+    def setColumn(self, name, values):
+        """sets the values of all contours of a column
+
+        Args:
+            name (str): name of the column
+            values (ndarray): one value per contour
+        """
+        dtype, shape, _ = self.scalar_columns[name]
+        values = np.asarray(values, dtype=dtype).reshape((len(self),) + shape)
+        self.columns[name] = values.copy()
+
+    def select(self, mask):
+        """returns a new table with the selected contours, the contour index is not changed
+
+        Args:
+            mask (ndarray): boolean mask or indices of the selected contours
+
+        Returns:
+            ContourTable: table with the selected contours
+        """
+        indices = np.arange(len(self))[mask]
+        lengths = self.getLengths()[indices]
+        offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(lengths)
+        #position in the new buffer plus the shift between old and new start of the contour
+        pointIndices = np.arange(offsets[-1]) + np.repeat(self.offsets[indices] - offsets[:-1], lengths)
+        table = ContourTable(self.points['contour_points_px'][pointIndices], offsets)
+        for name, points in self.points.items():
+            if points is not None:
+                table.points[name] = points[pointIndices]
+        for name, column in self.columns.items():
+            if column is not None:
+                table.columns[name] = column[indices]
+        return table
+
+    def getNumberOfBytes(self):
+        """returns the memory used by all columns and point buffers
+
+        Returns:
+            int: size in bytes
+        """
+        size = self.offsets.nbytes
+        size += sum(points.nbytes for points in self.points.values() if points is not None)
+        size += sum(column.nbytes for column in self.columns.values() if column is not None)
+        return size
+
+    def getValue(self, index, name):
+        """returns the value of a contour as python type, empty values are returned as None
+
+        Args:
+            index (int): index of the contour in the table
+            name (str): name of the column
+
+        Returns:
+            value of the contour
+        """
+        if name in self.point_columns:
+            points = self.points[name]
+            if points is None:
+                return None
+            return points[self.offsets[index]:self.offsets[index + 1]].reshape(self.point_columns[name][1])
+        column = self.columns[name]
+        if column is None:
+            return None
+        value = column[index]
+        dtype, shape, empty = self.scalar_columns[name]
+        if shape:
+            if dtype == np.float64:
+                if np.isnan(value).any():
+                    return None
+                return (float(value[0]), float(value[1]))
+            return (int(value[0]), int(value[1]))
+        if name == 'contour_is_hole':
+            return None if value == empty else bool(value)
+        if dtype == np.bool_:
+            return bool(value)
+        if dtype == np.float64:
+            return None if np.isnan(value) else float(value)
+        return int(value)
+
+    def setValue(self, index, name, value):
+        """sets the value of a contour, None empties the value
+
+        Args:
+            index (int): index of the contour in the table
+            name (str): name of the column
+            value: new value
+        """
+        if name in self.point_columns:
+            points = np.asarray(value).reshape(-1, 2)
+            if self.points[name] is None:
+                self.points[name] = np.zeros((self.offsets[-1], 2), dtype=self.point_columns[name][0])
+            self.points[name][self.offsets[index]:self.offsets[index + 1]] = points
+            return
+        dtype, shape, empty = self.scalar_columns[name]
+        if self.columns[name] is None:
+            self.columns[name] = np.full((len(self),) + shape, empty, dtype=dtype)
+        self.columns[name][index] = empty if value is None else value
+
+class ContourRecord():
+    """view of one contour of a ContourTable, reading and writing works like with a dictionary
+    """
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    def __getitem__(self, key):
+        if key not in self.table.keys:
+            raise KeyError(key)
+        return self.table.getValue(self.index, key)
+
+    def __setitem__(self, key, value):
+        if key not in self.table.keys:
+            raise KeyError(key)
+        self.table.setValue(self.index, key, value)
+
+    def __contains__(self, key):
+        return key in self.table.keys
+
+    def __iter__(self):
+        return iter(self.table.keys)
+
+    def keys(self):
+        return self.table.keys
+
+    def get(self, key, default=None):
+        if key not in self.table.keys:
+            return default
+        return self.table.getValue(self.index, key)
+
+    def update(self, values):
+        """sets several values of the contour
+
+        Args:
+            values (dict): new values by key
+        """
+        for key, value in values.items():
+            self[key] = value
@@ -18,12 +18,15 @@
 #You should have received a copy of the GNU General Public License
 #along with this program.  If not, see <https://www.gnu.org/licenses/>
 
-import os, pickle, glob, copy, cv2, ctypes, webbrowser, numpy as np, math, ezdxf, win32print, win32ui, win32api
+import os, pickle, glob, copy, cv2, ctypes, webbrowser, numpy as np, math, ezdxf, win32print, win32ui, win32api, time, collections, itertools, hashlib, threading, re
+from concurrent.futures import ThreadPoolExecutor
 from PyQt5.QtCore import QObject, pyqtSignal
 from PyQt5.QtGui import QPixmap
-from PyQt5.QtWidgets import QFileDialog
+from PyQt5.QtWidgets import QFileDialog, QInputDialog
 from PIL import Image, ImageWin
 
+from model.calibration_library import CalibrationLibrary
+from model.contour_table import ContourTable
 from helper.custom_exceptions import InappropriateParameterException, MissingInputException, NoCalDataException, NoChessboardException, NoFormException, NoGeneralCalibrationInformationException, NoImageException
 
 class DataModel(QObject):
@@ -68,17 +71,24 @@ class DataModel(QObject):
         self.status_icon_okay = None
         self.status_icon_wait = None
         self.status_icon_fail = None
+        self.calibrationFiles = None
         self.calibrationImages = None
+        self.calibrationImageSize = None
         self.originalImage = None
         self.chessboardImage = None
         self.threeChannelGrayImage = None
+        self.undistortedObjectImage = None
+        self.undistortedObjectImageSource = None
         self.binarizedImage = None
         self.mask = None
         self.indexImage = None
         self.contoursList = None
+        self.derivedCoordinatesKeys = {}
         self.originalImageSize_preCrop = None
         self.originalImageSize_afterCrop = None
         self.centerGrayImage = None
+        self.imageLoadStats = None
+        self.calImageLoadStats = None
 
         #cal data pickle
         self.cameraName = None
@@ -93,22 +103,34 @@ class DataModel(QObject):
         self.calROI = None
         self.chessboardSize = None
         self.meanError = None
-        #DICT FOR FOUND CONTOURS - JUST FOR INFO
+        self.undistortMaps = None
+        self.undistortMapsKey = None
+        self.reprojectionErrors = None
+        self.errorHeatmapGrid = (8, 6)
+        #COLUMNS OF THE CONTOUR TABLE, A CONTOUR CAN BE USED LIKE A DICT WITH THESE KEYS - JUST FOR INFO
         #contour_index           int
         #contour_points_px       []          np array with coordinates
         #contour_points_ref      []          np array with transformed coordinates
-        #contour_points_mm       []          np array with coordinates for cad
+        #contour_points_mm       []          np array with coordinates in mm relative to the reference point
+        #contour_points_cad      []          np array with coordinates for cad (y-axis from bottom to top)
         #contour_center_px       tuple       old center point
         #contour_area_px         float       area
         #contour_perimeter_px    float       perimeter
         #contour_is_hole         bool        wheather a contours is a hole or not(roundness >= 0.95)
+        #contour_parent_index    int         index of the surrounding contour, -1 if there is none
+        #contour_depth           int         number of surrounding contours
+        #contour_is_outline      bool        True if the contour surrounds other contours, an outline can not be a hole
         #center_point_ref        tuple       new center point
-        #center_point_ref_mm     tuple       new center point for cad
+        #center_point_ref_mm     tuple       new center point in mm
+        #center_point_cad        tuple       new center point for cad
         #roundness               float       roundness < 1
         #diameter_px             float       average diameter in pixel
         #diameter_mm             float (2)   average diameter in mm
         #deviation_px            float       maximal deviation from avg diameter in px
         #deviation_mm            float (2)   maximal deviation from average diameter in mm
+        #circle_center_px        tuple       center of the circle fitted to a hole, sub-pixel accurate
+        #circle_radius_px        float       radius of the circle fitted to a hole
+        #circle_residual_px      float       rms distance of the contour points to the fitted circle
         #set_diameter_manually   bool        True if diameter [mm] was set manually
         
         #settings pickle
@@ -121,9 +143,18 @@ class DataModel(QObject):
         self.showNewInfoAtStartup = False
         self.generateMask = False
         self.roundnessThreshold = 0.9
+        self.maxRingWidth = 1.0#mm, inner edges of thinner rings (e.g. drawn lines) are removed as duplicates of the outer edge
         self.wasDisclaimerAccepted = False
         self.morph_options = ['', 'Dilation', 'Erosion', 'Opening', 'Closing']
         self.morphMode = 1#default = dilation
+        self.undistort_options = ['Full image', 'ROI only', 'Sparse points']
+        self.undistortMode = 1#default = only the calibration ROI is undistorted
+        self.chessboard_engine_options = ['Classic', 'Pyramid', 'Sector based']
+        self.chessboard_engine_flags = [cv2.CALIB_CB_ADAPTIVE_THRESH + cv2.CALIB_CB_NORMALIZE_IMAGE,
+            cv2.CALIB_CB_ADAPTIVE_THRESH + cv2.CALIB_CB_NORMALIZE_IMAGE + cv2.CALIB_CB_FAST_CHECK,
+            cv2.CALIB_CB_EXHAUSTIVE + cv2.CALIB_CB_ACCURACY]
+        self.chessboardEngine = 1#default = coarse detection on a downscaled image, refinement in full resolution
+        self.pyramidMaxWidth = 1000
 
         #program vars
         self.chessboardRows = 6
@@ -134,12 +165,40 @@ class DataModel(QObject):
         self.imgPoints = None
         self.objp = None
         self.criteria = None
+        self.detectionWorkers = os.cpu_count()
+        self.detectionResults = None
+        self.keepCalibrationThumbnails = False
+        self.calibrationThumbnailWidth = 320
+        self.calibrationViews = None
+        self.maxViewError = 1.0
+        self.minCalibrationViews = 3
+        self.cornerCache = None
+        self.cornerCacheChanged = False
+        self.cornerCacheMaxEntries = 2000
+        self.cornerCacheLock = threading.Lock()
+        self.detectionStats = {}
+        self.calibrationLibrary = None
+        self.calibrationEntry = None
+        self.calibrationScale = None
+        self.activeCalibrationScale = None
+        self.scaledCalibrations = {}
         self.objectDistance = None
         self.mmPerPxRatio = None
+        self.pxToMmHomography = None
+        self.homographyResiduals = None
         self.meanError = None
         self.referencePoint = None
+        self.pxToMmTransform = None
+        self.pxToCadTransform = None
+        self.coordinateTransformsKey = None
         self.referenceImage_path = None
         self.referenceList_path = None
+        self.undistortionComparison = None
+        self.maxComparisonOffset = 5.0#px, a sparse contour without a dense contour this close has no partner in the fully undistorted image
+        self.hsvReferenceImage = None
+        self.hsvReferenceVersion = 1#increase when the layout of the hsv reference image changes, older cached images are not used
+        self.contourPrefilter = False#removes interference before the contours are traced, pays off for images with a lot of interference
+        self.contourPrefilterStats = None
         self.disclaimerText = ('SAFETY WARNING\n\n'
             'It might be possible that external (possibly harmful) code can be loaded during runtime,\n'
             'especially while loading calibration data or settings.\n'
@@ -200,8 +259,15 @@ class DataModel(QObject):
         self.rotVector = None
         self.tanVector = None
         self.calROI = None
+        self.calibrationEntry = None
+        self.calibrationScale = None
+        self.activeCalibrationScale = None
+        self.scaledCalibrations = {}
         self.chessboardSize = None
         self.meanError = None
+        self.undistortMaps = None
+        self.undistortMapsKey = None
+        self.reprojectionErrors = None
         self.workspaceDir = None
         self.workspaceSetState = False
         self.scaleFactor = 0.2
@@ -209,18 +275,26 @@ class DataModel(QObject):
         self.showImagesDuration = None
         self.debugMode = False
         self.showNewInfoAtStartup = False
+        self.calibrationFiles = None
         self.calibrationImages = None
+        self.calibrationImageSize = None
         self.originalImage = None
         self.chessboardImage = None
         self.threeChannelGrayImage = None
+        self.undistortedObjectImage = None
+        self.undistortedObjectImageSource = None
         self.centerGrayImage = None
+        self.imageLoadStats = None
+        self.calImageLoadStats = None
         self.mask = None
         self.indexImage = None
         self.contoursList = None
+        self.derivedCoordinatesKeys = {}
         self.originalImageSize_preCrop = None
         self.originalImageSize_afterCrop = None
         self.generateMask = False
         self.roundnessThreshold = 0.9
+        self.maxRingWidth = 1.0
         self.chessboardRows = 6
         self.chessboardColumns = 8
         self.chessboardSize = 20
@@ -229,12 +303,20 @@ class DataModel(QObject):
         self.imgPoints = None
         self.objp = None
         self.criteria = None
+        self.detectionResults = None
+        self.calibrationViews = None
         self.objectDistance = None
         self.mmPerPxRatio = None
+        self.pxToMmHomography = None
+        self.homographyResiduals = None
         self.meanError = None
         self.referencePoint = None
+        self.pxToMmTransform = None
+        self.pxToCadTransform = None
+        self.coordinateTransformsKey = None
         self.referenceImage_path = None
         self.referenceList_path = None
+        self.undistortionComparison = None
 
     def undoCalibrationProgress(self):
         """restarts calibration process
@@ -242,7 +324,10 @@ class DataModel(QObject):
         Returns:
             bool: True
         """
+        self.calibrationFiles = None
         self.calibrationImages = None
+        self.calibrationImageSize = None
+        self.calImageLoadStats = None
         self.cameraOwner = None
         self.cameraName = None
         self.lensName = None
@@ -255,9 +340,14 @@ class DataModel(QObject):
         self.imgPoints = None
         self.objp = None
         self.criteria = None
+        self.detectionResults = None
+        self.calibrationViews = None
         self.objectDistance = None
         self.mmPerPxRatio = None
+        self.pxToMmHomography = None
+        self.homographyResiduals = None
         self.meanError = None
+        self.reprojectionErrors = None
         return True
 
     def undoProcessProgress(self):
@@ -269,7 +359,10 @@ class DataModel(QObject):
         self.binarizedImage = None
         self.binarizeState = False
         self.contoursList = None
+        self.derivedCoordinatesKeys = {}
+        self.contourPrefilterStats = None
         self.contoursState = False
+        self.undistortionComparison = None
         return True
 
     def makeSubDirs(self):
@@ -406,6 +499,10 @@ class DataModel(QObject):
                 self.roundnessThreshold = settingsPickle['roundness_threshold']
                 self.wasDisclaimerAccepted = settingsPickle['disclaimer_accepted']
                 self.morphMode = settingsPickle['morph_mode']
+                self.undistortMode = settingsPickle.get('undistort_mode', self.undistortMode)
+                self.chessboardEngine = settingsPickle.get('chessboard_engine', self.chessboardEngine)
+                self.contourPrefilter = settingsPickle.get('contour_prefilter', self.contourPrefilter)
+                self.maxRingWidth = settingsPickle.get('max_ring_width', self.maxRingWidth)
             except Exception as e:
                 return False
 
@@ -431,6 +528,10 @@ class DataModel(QObject):
         settingsPickle['roundness_threshold'] = self.roundnessThreshold
         settingsPickle['disclaimer_accepted'] = self.wasDisclaimerAccepted
         settingsPickle['morph_mode'] = self.morphMode
+        settingsPickle['undistort_mode'] = self.undistortMode
+        settingsPickle['chessboard_engine'] = self.chessboardEngine
+        settingsPickle['contour_prefilter'] = self.contourPrefilter
+        settingsPickle['max_ring_width'] = self.maxRingWidth
         try:
             pickle.dump(settingsPickle, open(filename, 'wb'))
             return True
@@ -438,35 +539,173 @@ class DataModel(QObject):
             return False
 
     def loadCalibrationData(self):
+        """loads calibration data. the calibrations of the library are offered for selection,
+        calibration pickles of older versions can still be opened with a file dialog
+
+        Returns:
+            bool: True if calibration was loaded and processed, False when Exception occured or nothing was selected
+        """
+        library = self._getCalibrationLibrary()
+        entries = library.query(latestOnly=True)
+        openFile = 'Open calibration file...'
+        items = [library.getEntryName(entry) for entry in entries] + [openFile]
+        item, ok = QInputDialog.getItem(None, 'Load calibration', 'Calibration', items, 0, False)
+        if not ok:
+            return False
+        if item == openFile:
+            file = self._openFile(self.data_subdir, 'pickle')
+            if file:
+                return self._loadCalibrationPickle(file)
+            return False
+        return self.loadCalibrationFromLibrary(entries[items.index(item)]['id'])
+
+    def _loadCalibrationPickle(self, file):
         """loads calibration data from a pickle file
 
+        Args:
+            file (str): path of the calibration pickle
+
         Returns:
             bool: True if file was loaded and processed, False when Exception occured
         """
-        file = self._openFile(self.data_subdir, 'pickle')
-        if file:
+        try:
+            calData_pickle = pickle.load(open(file, 'rb'))
+            self.cameraName = calData_pickle['cam_name']
+            self.lensName = calData_pickle['lens_name']
+            self.cameraOwner = calData_pickle['owner']
+            self.lensFocalLength = calData_pickle['foc_len']
+            self.cameraMatrix = calData_pickle['mtx']
+            self.new_cameraMatrix = calData_pickle['new_mtx']
+            self.distMatrix = calData_pickle['dist']
+            self.rotVector = calData_pickle['rvec']
+            self.tanVector = calData_pickle['tvec']
+            self.calROI = calData_pickle['roi']
+            self.chessboardSize = calData_pickle['square_size']
+            self.meanError = calData_pickle['mean_error']
+            self.reprojectionErrors = calData_pickle.get('reprojection_errors')
+            self.calibrationEntry = None
+            self._loadUndistortMaps(file)
+            self.calibrationImageSize = self._getCalibrationPickleImageSize(file, calData_pickle)
+            self._setMasterCalibration(calData_pickle['scale'])
+            if not self.applyCalibrationScale(self.scaleFactor):
+                #without the size of the calibration images it can only be used with the scale factor it was saved with
+                return False
+            self.setCalibrationState(True)
+            return True
+        except Exception as e:
+            return False
+
+    def _getCalibrationPickleImageSize(self, file, calData_pickle):
+        """returns the size of the calibration images of a calibration pickle. older pickles do not store it,
+        then it is taken from the remap tables, the file name or the first calibration image
+
+        Args:
+            file (str): path of the calibration pickle
+            calData_pickle (dict): content of the calibration pickle
+
+        Returns:
+            tuple/ None: width and height of the calibration images, None if unknown
+        """
+        if calData_pickle.get('image_size') is not None:
+            return tuple(calData_pickle['image_size'])
+        if self.undistortMapsKey is not None:
+            return self.undistortMapsKey[3]
+        #pickles are saved as <names>_<width>x<height>_calData.p
+        match = re.search(r'_(\d+)x(\d+)_calData\.p$', os.path.basename(file))
+        if match:
+            return (int(match.group(1)), int(match.group(2)))
+        if self.calibrationFiles:
+            scaleFactor = self.scaleFactor
+            self.scaleFactor = calData_pickle['scale']
             try:
-                calData_pickle = pickle.load(open(file, 'rb'))
-                self.cameraName = calData_pickle['cam_name']
-                self.lensName = calData_pickle['lens_name']
-                self.cameraOwner = calData_pickle['owner']
-                self.lensFocalLength = calData_pickle['foc_len']
-                self.scaleFactor = calData_pickle['scale']
-                self.cameraMatrix = calData_pickle['mtx']
-                self.new_cameraMatrix = calData_pickle['new_mtx']
-                self.distMatrix = calData_pickle['dist']
-                self.rotVector = calData_pickle['rvec']
-                self.tanVector = calData_pickle['tvec']
-                self.calROI = calData_pickle['roi']
-                self.chessboardSize = calData_pickle['square_size']
-                self.meanError = calData_pickle['mean_error']
-                self.setCalibrationState(True)
-                return True
+                img, _ = self._readImageScaled(self.calibrationFiles[0])
+                return (img.shape[1], img.shape[0])
             except Exception as e:
+                return None
+            finally:
+                self.scaleFactor = scaleFactor
+        return None
+
+    def loadCalibrationFromLibrary(self, entryId):
+        """loads a calibration of the library. the remap tables stay memory mapped
+
+        Args:
+            entryId (int): id of the library entry
+
+        Returns:
+            bool: True if calibration was loaded and processed, False when entry was not found or Exception occured
+        """
+        try:
+            loaded = self._getCalibrationLibrary().load(entryId)
+            if loaded is None:
+                return False
+            entry, arrays = loaded
+            meta = entry['meta']
+            self.cameraName = entry['camera']
+            self.lensName = entry['lens']
+            self.cameraOwner = entry['owner']
+            self.lensFocalLength = entry['focal_length']
+            self.calibrationImageSize = (entry['width'], entry['height'])
+            self.cameraMatrix = np.array(arrays['mtx'])
+            self.new_cameraMatrix = np.array(arrays['new_mtx'])
+            self.distMatrix = np.array(arrays['dist'])
+            self.rotVector = [np.array(r) for r in arrays['rvec']] if 'rvec' in arrays else None
+            self.tanVector = [np.array(t) for t in arrays['tvec']] if 'tvec' in arrays else None
+            self.calROI = tuple(int(i) for i in arrays['roi'])
+            self.chessboardSize = meta.get('square_size')
+            self.meanError = meta.get('mean_error')
+            self.reprojectionErrors = None
+            if 'errors_per_view' in arrays:
+                self.reprojectionErrors = {key[len('errors_'):]: np.array(value) for key, value in arrays.items() if key.startswith('errors_')}
+                self.reprojectionErrors['rms'] = meta.get('rms')
+                self.reprojectionErrors['max'] = meta.get('max')
+            self.undistortMaps = None
+            self.undistortMapsKey = None
+            if 'map1' in arrays and 'map2' in arrays:
+                roi = tuple(int(i) for i in arrays['map_roi']) if arrays['map_roi'].size == 4 else None
+                self.undistortMaps = (arrays['map1'], arrays['map2'])
+                self.undistortMapsKey = self._getUndistortMapsKey(self.calibrationImageSize, roi)
+            self.calibrationEntry = entryId
+            self._setMasterCalibration(entry['scale'])
+            self.applyCalibrationScale(self.scaleFactor)
+            self.setCalibrationState(True)
+            return True
+        except Exception as e:
+            return False
+
+    def selectCalibration(self, camera, lens, resolution, scale=None):
+        """selects the newest calibration of the library for a camera, lens and image resolution.
+        calibrations saved with another scale factor are used when their resolution matches after rescaling.
+        nothing is loaded if the selected calibration is already in use
+
+        Args:
+            camera (str): name of the camera
+            lens (str): name of the lens
+            resolution (tuple): width and height of the images
+            scale (float, optional): scale factor the images are loaded with. Defaults to None = saved scale factor.
+
+        Returns:
+            bool: True if a matching calibration is loaded, else False
+        """
+        if scale is None:
+            scale = self.scaleFactor
+        library = self._getCalibrationLibrary()
+        entry = library.find(camera, lens, resolution, scale)
+        if entry is None:
+            for candidate in library.query(camera=camera, lens=lens):
+                r = scale / candidate['scale']
+                if abs(candidate['width'] * r - resolution[0]) <= 1 and abs(candidate['height'] * r - resolution[1]) <= 1:
+                    entry = candidate
+                    break
+        if entry is None:
+            return False
+        if entry['id'] != self.calibrationEntry or not self.calibrationState:
+            if not self.loadCalibrationFromLibrary(entry['id']):
                 return False
+        return self.applyCalibrationScale(scale)
 
     def saveCalibrationData(self):
-        """saves the generated calibration data to a pickle file
+        """saves the generated calibration data as new version to the calibration library
 
         Raises:
             NoGeneralCalibrationInformationException: When no general data was generated before executing function
@@ -478,34 +717,59 @@ class DataModel(QObject):
         if self.calibrationState:
             if (self.cameraOwner or self.cameraName or self.lensName or self.lensFocalLength) == None:
                 raise NoGeneralCalibrationInformationException
-            calData_pickle = {}
-            calData_pickle['cam_name'] = self.cameraName
-            calData_pickle['lens_name'] = self.lensName
-            calData_pickle['owner'] = self.cameraOwner
-            calData_pickle['foc_len'] = self.lensFocalLength
-            calData_pickle['scale'] = self.scaleFactor
-            calData_pickle['mtx'] = self.cameraMatrix
-            calData_pickle['new_mtx'] = self.new_cameraMatrix
-            calData_pickle['dist'] = self.distMatrix
-            calData_pickle['rvec'] = self.rotVector
-            calData_pickle['tvec'] = self.tanVector
-            calData_pickle['roi'] = self.calROI
-            calData_pickle['square_size'] = self.chessboardSize
-            calData_pickle['mean_error'] = self.meanError
-            h, w = self.calibrationImages[0].shape[:2]
-            if self.workspaceSetState:
-                path = self.workspaceDir  + '/data/'
-            else:
-                path = self.data_subdir + '/'
-            filepathAndName = path + self.cameraOwner[0:3] + self.cameraName[0:5] + self.lensName[0:3] + '_' + str(w) + 'x' + str(h) + '_calData.p'
+            if self.calibrationImageSize is None:
+                #remap tables and library entry need the size of the calibration images
+                return False
+            w, h = self.calibrationImageSize
+            #the master calibration is saved, derived scales are calculated again after loading
+            activeScale = self.activeCalibrationScale
+            self.applyCalibrationScale(self.calibrationScale)
             try:
-                pickle.dump(calData_pickle, open(filepathAndName, 'wb'))
+                map1, map2 = self._getUndistortMaps((w, h))
+                mapROI = self._getUndistortROI()
+                arrays = {
+                    'mtx': self.cameraMatrix,
+                    'new_mtx': self.new_cameraMatrix,
+                    'dist': self.distMatrix,
+                    'rvec': np.array(self.rotVector) if self.rotVector is not None else None,
+                    'tvec': np.array(self.tanVector) if self.tanVector is not None else None,
+                    'roi': np.array(self.calROI),
+                    'map1': map1,
+                    'map2': map2,
+                    'map_roi': np.array(mapROI if mapROI is not None else ())
+                }
+                meta = {'square_size': self.chessboardSize, 'mean_error': self.meanError}
+                if self.reprojectionErrors is not None:
+                    for key, value in self.reprojectionErrors.items():
+                        if isinstance(value, np.ndarray):
+                            arrays['errors_' + key] = value
+                        else:
+                            meta[key] = value
+                entry = self._getCalibrationLibrary().save(self.cameraOwner, self.cameraName, self.lensName, self.lensFocalLength, (w, h), self.calibrationScale, arrays, meta)
+                self.calibrationEntry = entry['id']
                 return True
             except Exception as e:
                 return False
+            finally:
+                self.applyCalibrationScale(activeScale)
         else:
             raise NoCalDataException()
 
+    def _getCalibrationLibrary(self):
+        """returns the calibration library, it is opened with the first access.
+        the library is located in the data directory of the workspace if one is set
+
+        Returns:
+            CalibrationLibrary: library with all saved calibrations
+        """
+        if self.workspaceSetState:
+            path = self.workspaceDir + '/data/calibration_library'
+        else:
+            path = self.data_subdir + '/calibration_library'
+        if self.calibrationLibrary is None or self.calibrationLibrary.path != path:
+            self.calibrationLibrary = CalibrationLibrary(path)
+        return self.calibrationLibrary
+
     def calculateCalibrationData(self):
         """calculates calibration data
 
@@ -516,7 +780,7 @@ class DataModel(QObject):
             bool: True if process was succesfull, else False
         """
         #check if a size of chessboard aquares was given for calculation and store as state
-        if self.calibrationImages == None or len(self.calibrationImages) == 0:
+        if self.calibrationFiles == None or len(self.calibrationFiles) == 0:
             raise NoImageException()
         if self.chessboardSize == None or self.chessboardSize == 1.0:
             self.chessboardSquareState = False
@@ -534,46 +798,240 @@ class DataModel(QObject):
             duration = self.showImagesDuration
         objp = np.zeros((self.chessboardRows * self.chessboardColumns, 3), np.float32)
         objp[:,:2] = np.mgrid[0:self.chessboardRows, 0:self.chessboardColumns].T.reshape(-1, 2) * self.chessboardSize
-        objPoints = []
-        imgPoints = []
+        views = []
         criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.001)
-
-        for img in self.calibrationImages:
-            temp = copy.copy(img)
-            gray_temp = cv2.cvtColor(temp, cv2.COLOR_BGR2GRAY)
-            ret, corners = cv2.findChessboardCorners(gray_temp, (self.chessboardRows, self.chessboardColumns), None)
-            if ret == True:
-                objPoints.append(objp)
-                corners2 = cv2.cornerSubPix(gray_temp, corners, (5,5), (-1,-1), criteria)
-                imgPoints.append(corners2)
+        patternSize = (self.chessboardRows, self.chessboardColumns)
+
+        #images are decoded and searched for corners ahead in a bounded thread pool, cv2 releases the GIL while working
+        #results arrive in the order of the calibration files, only the corners are kept
+        detectionResults = []
+        thumbnails = []
+        imageSize = None
+        decodeTime = 0
+        for result in self._iterCalibrationImages(self.calibrationFiles, patternSize, criteria, keepImage=showImages):
+            decodeTime += result['decode_time']
+            if result['image_size'] is not None:
+                if imageSize is None:
+                    imageSize = result['image_size']
+                elif result['image_size'] != imageSize:
+                    result['found'] = False
+                    result['error'] = 'Image size differs from first calibration image'
+            detectionResults.append({'image_index': result['image_index'], 'file': result['file'], 'found': result['found'],
+                'duration': result['duration'], 'error': result['error'], 'cached': result['cached']})
+            if result['thumbnail'] is not None:
+                thumbnails.append(result['thumbnail'])
+            if result['found'] == True:
+                views.append(self._createCalibrationView(result))
                 if showImages:
-                    temp = cv2.drawChessboardCorners(temp, (self.chessboardColumns, self.chessboardRows), corners2, ret)
+                    temp = cv2.drawChessboardCorners(result['image'], (self.chessboardColumns, self.chessboardRows), result['corners'], True)
                     temp_img = self._scaleImageForScreen(temp)
                     cv2.imshow('Chessboard images', temp_img)
                     cv2.waitKey(duration)
                     cv2.destroyAllWindows()
-        ret = None
-        ret, cameraMatrix, distMatrix, rotVector, tanVector = cv2.calibrateCamera(objPoints, imgPoints, gray_temp.shape[::-1], None, None)
-        if ret is not None:
-            self.cameraMatrix = cameraMatrix
-            self.distMatrix = distMatrix
-            self.rotVector = rotVector
-            self.tanVector = tanVector
-            self.objPoints = objPoints
-            self.imgPoints = imgPoints
-        else:
+        self.detectionResults = detectionResults
+        self._saveCornerCache()
+        self.calImageLoadStats = {'images': len(detectionResults), 'decode_time': decodeTime, 'peak_memory': self._getPeakMemoryUsage()}
+        if self.keepCalibrationThumbnails:
+            self.calibrationImages = thumbnails
+        if len(views) == 0:
             return False
-        new_cameraMatrix, calROI = self._createNewOptimalCameraMatrix()
-        if new_cameraMatrix.any() and calROI is not None:
-            self.new_cameraMatrix = new_cameraMatrix
-            self.calROI = calROI
-            result = self._calcMeanError()
-            if result == True:
-                return True
-            else:
-                return False
-        else:
+        self.calibrationImageSize = imageSize
+        self.calibrationViews = views
+        self.objp = objp
+        self.criteria = criteria
+        self.calibrationScale = self.scaleFactor
+        self.activeCalibrationScale = None
+        self.scaledCalibrations = {}
+        return self.recalibrate(warmStart=False)
+
+    def addCalibrationImagesFromDirectory(self):
+        """opens dialog to select a directory, then adds all images in directory to the existing calibration
+
+        Returns:
+            bool: True if the calibration was solved again, else False
+        """
+        files = self._openFileDirectory('jpg')
+        if not files:
+            return False
+        return self.addCalibrationImages(sorted(files))
+
+    def addCalibrationImages(self, files=None):
+        """adds images to an existing calibration. only the new images are searched for chessboard corners,
+        then the calibration is solved again, starting from the current camera matrix and distortion
+
+        Args:
+            files (list): paths of the images that should be added
+
+        Raises:
+            MissingInputException: raised when no files given or no calibration was calculated before
+            NoChessboardException: raised when no chessboard detected in any of the new images
+
+        Returns:
+            bool: True if the calibration was solved again, else False
+        """
+        if not files or self.calibrationViews is None or self.objp is None:
+            raise MissingInputException()
+        patternSize = (self.chessboardRows, self.chessboardColumns)
+        if self.calibrationFiles is None:
+            self.calibrationFiles = []
+        if self.detectionResults is None:
+            self.detectionResults = []
+        offset = len(self.calibrationFiles)
+        viewCount = len(self.calibrationViews)
+        #new images are read with the scale factor of the master calibration
+        scaleFactor = self.scaleFactor
+        self.scaleFactor = self.calibrationScale
+        try:
+            for result in self._iterCalibrationImages(files, patternSize, self.criteria):
+                result['image_index'] += offset
+                if result['image_size'] is not None and result['image_size'] != self.calibrationImageSize:
+                    result['found'] = False
+                    result['error'] = 'Image size differs from first calibration image'
+                self.detectionResults.append({'image_index': result['image_index'], 'file': result['file'], 'found': result['found'],
+                    'duration': result['duration'], 'error': result['error'], 'cached': result['cached']})
+                if result['found'] == True:
+                    self.calibrationViews.append(self._createCalibrationView(result))
+        finally:
+            self.scaleFactor = scaleFactor
+        self._saveCornerCache()
+        self.calibrationFiles = self.calibrationFiles + list(files)
+        if len(self.calibrationViews) == viewCount:
+            raise NoChessboardException()
+        #rejected views are judged again with the calibration including the new images
+        for view in self.calibrationViews:
+            if view['rejected']:
+                view['active'] = True
+                view['rejected'] = False
+        return self.recalibrate(warmStart=True)
+
+    def removeCalibrationImage(self, imageIndex=None):
+        """removes the view of a calibration image and solves the calibration again,
+        starting from the current camera matrix and distortion
+
+        Args:
+            imageIndex (int): index of the image in the calibration files
+
+        Raises:
+            MissingInputException: raised when no index given or no calibration was calculated before
+
+        Returns:
+            bool: True if the calibration was solved again, else False
+        """
+        if imageIndex is None or self.calibrationViews is None:
+            raise MissingInputException()
+        self.calibrationViews = [view for view in self.calibrationViews if view['image_index'] != imageIndex]
+        return self.recalibrate(warmStart=True)
+
+    def recalibrate(self, warmStart=True):
+        """solves the calibration with all active views. afterwards views with a reprojection error
+        above maxViewError are rejected and the calibration is solved once more without them
+
+        Args:
+            warmStart (bool): whether the current camera matrix and distortion are used as initial guess
+
+        Raises:
+            MissingInputException: raised when no views found
+
+        Returns:
+            bool: True if process was succesfull, else False
+        """
+        if self.calibrationViews is None or self.calibrationImageSize is None:
+            raise MissingInputException()
+        #views are in the resolution of the master calibration
+        self.applyCalibrationScale(self.calibrationScale)
+        result = self._solveCalibration(warmStart=warmStart)
+        if result == True and self.maxViewError is not None:
+            active = [view for view in self.calibrationViews if view['active']]
+            rejected = [view for view in active if view['error'] > self.maxViewError]
+            if len(rejected) > 0 and len(active) - len(rejected) >= self.minCalibrationViews:
+                for view in rejected:
+                    view['active'] = False
+                    view['rejected'] = True
+                result = self._solveCalibration(warmStart=True)
+        if result == True:
+            self.applyCalibrationScale(self.scaleFactor)
+        return result
+
+    def applyCalibrationScale(self, scale):
+        """switches camera matrix, new camera matrix, ROI and remap tables to images loaded with the given scale factor.
+        they are derived from the master calibration once per scale factor, switching back to a known scale is free
+
+        Args:
+            scale (float): scale factor the images are loaded with
+
+        Returns:
+            bool: True if the calibration was switched, False when no calibration exists or it can not be scaled
+        """
+        if scale is None or self.calibrationScale not in self.scaledCalibrations:
             return False
+        if scale == self.activeCalibrationScale:
+            return True
+        if scale not in self.scaledCalibrations:
+            scaled = self._deriveScaledCalibration(scale)
+            if scaled is None:
+                return False
+            self.scaledCalibrations[scale] = scaled
+        if self.activeCalibrationScale in self.scaledCalibrations:
+            self.scaledCalibrations[self.activeCalibrationScale]['maps'] = (self.undistortMaps, self.undistortMapsKey)
+        scaled = self.scaledCalibrations[scale]
+        self.cameraMatrix = scaled['mtx']
+        self.new_cameraMatrix = scaled['new_mtx']
+        self.calROI = scaled['roi']
+        self.undistortMaps, self.undistortMapsKey = scaled['maps']
+        self.activeCalibrationScale = scale
+        return True
+
+    def _setMasterCalibration(self, scale):
+        """stores the current camera matrix, new camera matrix, ROI and remap tables as master calibration,
+        all scales derived from an older calibration are dropped
+
+        Args:
+            scale (float): scale factor the calibration images were loaded with
+        """
+        self.calibrationScale = scale
+        self.scaledCalibrations = {scale: {
+            'mtx': self.cameraMatrix,
+            'new_mtx': self.new_cameraMatrix,
+            'roi': self.calROI,
+            'size': self.calibrationImageSize,
+            'maps': (self.undistortMaps, self.undistortMapsKey)
+        }}
+        self.activeCalibrationScale = scale
+
+    def _deriveScaledCalibration(self, scale):
+        """derives camera matrix, new camera matrix and ROI for another scale factor from the master calibration.
+        focal lengths are multiplied with the ratio of the scale factors, the principal point is moved
+        so pixel centers of both resolutions cover the same area
+
+        Args:
+            scale (float): scale factor the images are loaded with
+
+        Returns:
+            dict/ None: scaled camera matrix, new camera matrix, ROI, image size and empty remap tables,
+                        None if the size of the calibration images is unknown
+        """
+        master = self.scaledCalibrations[self.calibrationScale]
+        if master['size'] is None:
+            return None
+        r = scale / self.calibrationScale
+        scaling = np.array([[r, 0, 0.5 * r - 0.5], [0, r, 0.5 * r - 0.5], [0, 0, 1]])
+        roi = master['roi']
+        if roi is not None:
+            x, y, w, h = roi
+            #only pixels completely inside the master ROI stay in the scaled ROI
+            x0 = int(math.ceil((x + 0.5) * r - 0.5))
+            y0 = int(math.ceil((y + 0.5) * r - 0.5))
+            x1 = int(math.floor((x + w - 0.5) * r - 0.5))
+            y1 = int(math.floor((y + h - 0.5) * r - 0.5))
+            roi = (x0, y0, max(0, x1 - x0 + 1), max(0, y1 - y0 + 1)) if w > 0 and h > 0 else roi
+        size = (int(round(master['size'][0] * r)), int(round(master['size'][1] * r)))
+        return {
+            'mtx': scaling @ master['mtx'],
+            'new_mtx': scaling @ master['new_mtx'],
+            'roi': roi,
+            'size': size,
+            'maps': (None, None)
+        }
 
     def undistortAndCropImage(self, image=None):
         """undistorts and crops an image after calibration progress finished
@@ -590,16 +1048,113 @@ class DataModel(QObject):
         if not (image.any() or self.cameraMatrix.any() or self.distMatrix.any() or self.new_cameraMatrix.any() or self.calROI.any()):
             raise MissingInputException()
         try:
-            #undistort
-            undistortedImage = cv2.undistort(image, self.cameraMatrix, self.distMatrix, None, self.new_cameraMatrix)
-            #crop
-            x, y, w, h = self.calROI
-            croppedImage = undistortedImage[y:y+h, x:x+w]
+            #undistort with cached remap tables
+            h, w = image.shape[:2]
+            map1, map2 = self._getUndistortMaps((w, h))
+            if self._getUndistortROI() is not None:
+                #remap tables only cover the ROI, output is already cropped
+                croppedImage = cv2.remap(image, map1, map2, cv2.INTER_LINEAR)
+            else:
+                undistortedImage = cv2.remap(image, map1, map2, cv2.INTER_LINEAR)
+                #crop
+                x, y, w, h = self.calROI
+                croppedImage = undistortedImage[y:y+h, x:x+w]
             croppedImage_shape = croppedImage.shape
             return croppedImage, croppedImage_shape
         except Exception as e:
             return None, None
 
+    def getUndistortedImageShape(self, image):
+        """returns the shape an image has after undistorting and cropping without undistorting it
+
+        Args:
+            image (ndarray): image as NumPy ndarray
+
+        Returns:
+            tuple: shape of the cropped image
+        """
+        if self.calROI is None:
+            return image.shape
+        x, y, w, h = [int(i) for i in self.calROI]
+        return (h, w) + image.shape[2:]
+
+    def getObjectImageForDrawing(self):
+        """returns the object image in the coordinates of the found contours.
+        in sparse undistortion mode the object image stays distorted, it is undistorted and cropped once for drawing
+
+        Returns:
+            ndarray: object image as NumPy ndarray
+        """
+        if not self.isSparseUndistortion():
+            return self.originalImage
+        if self.undistortedObjectImageSource is not self.originalImage:
+            self.undistortedObjectImage, _ = self.undistortAndCropImage(image=self.originalImage)
+            self.undistortedObjectImageSource = self.originalImage
+        return self.undistortedObjectImage
+
+    def isSparseUndistortion(self):
+        """returns whether object images are processed distorted and only the found contour points get undistorted
+
+        Returns:
+            bool: True if sparse undistortion mode is selected
+        """
+        return self.undistortMode == 2
+
+    def undistortImagePoint(self, point=None):
+        """maps a point of the distorted object image into the undistorted and cropped image,
+        points are only mapped in sparse undistortion mode
+
+        Args:
+            point (tuple): x and y coordinate of a point in the object image
+
+        Raises:
+            MissingInputException: raised when no point given
+
+        Returns:
+            tuple: x and y coordinate in the undistorted and cropped image
+        """
+        if point is None:
+            raise MissingInputException()
+        if not self.isSparseUndistortion():
+            return point
+        undistorted = self._undistortPoints(np.array([[point]], dtype=np.float32))
+        x, y = undistorted[0][0]
+        return (int(round(x)), int(round(y)))
+
+    def createErrorHeatmapImage(self, width=640):
+        """creates a color image of the reprojection error heatmap over the sensor,
+        each cell is labeled with its mean error in px
+
+        Args:
+            width (int): width of the created image
+
+        Raises:
+            NoCalDataException: raised when no reprojection errors were calculated
+
+        Returns:
+            ndarray: heatmap image as NumPy ndarray
+        """
+        if self.reprojectionErrors is None or self.reprojectionErrors.get('heatmap') is None:
+            raise NoCalDataException()
+        heatmap = self.reprojectionErrors['heatmap']
+        rows, columns = heatmap.shape
+        maxError = np.nanmax(heatmap) if np.any(~np.isnan(heatmap)) else 0
+        if maxError > 0:
+            normalized = np.nan_to_num(heatmap / maxError * 255).astype(np.uint8)
+        else:
+            normalized = np.zeros(heatmap.shape, np.uint8)
+        cellSize = int(width / columns)
+        image = cv2.applyColorMap(normalized, cv2.COLORMAP_JET)
+        image = cv2.resize(image, (cellSize * columns, cellSize * rows), interpolation=cv2.INTER_NEAREST)
+        for row in range(rows):
+            for col in range(columns):
+                if np.isnan(heatmap[row, col]):
+                    cv2.rectangle(image, (col*cellSize, row*cellSize), ((col+1)*cellSize-1, (row+1)*cellSize-1), (64, 64, 64), -1)
+                    continue
+                text = f'{heatmap[row, col]:.2f}'
+                cv2.putText(image, text, (col*cellSize + 5, row*cellSize + int(cellSize/2)), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1, cv2.LINE_AA)
+        return image
+
     def calcCameraObjectDistance(self):
         """calculates distance between object and camera sensor and the mm per pixel ratio of the image
 
@@ -624,43 +1179,79 @@ class DataModel(QObject):
             imgpoints = []
             objp = np.zeros((self.chessboardRows * self.chessboardColumns, 3), np.float32)
             objp[:,:2] = np.mgrid[0:self.chessboardRows, 0:self.chessboardColumns].T.reshape(-1,2) * self.chessboardSize
-            ret, corners = cv2.findChessboardCorners(gray_img, (self.chessboardRows,self.chessboardColumns), None)
+            patternSize = (self.chessboardRows, self.chessboardColumns)
             criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.001)
+            contentHash = hashlib.sha1(np.ascontiguousarray(self.chessboardImage).tobytes()).hexdigest()
+            key = self._getCornerCacheKey('object', contentHash, patternSize, criteria)
+            cached = self._getCachedCorners(key)
+            if cached is not None:
+                ret, corners2, _ = cached
+            else:
+                ret, corners2 = self._findChessboardCorners(gray_img, patternSize, criteria)
+                self._setCachedCorners(key, (ret, corners2, gray_img.shape[1::-1]))
+                self._saveCornerCache()
             if ret == True:
                 objpoints.append(objp)
-                corners2 = cv2.cornerSubPix(gray_img, corners, (5,5), (-1,-1), criteria)
                 imgpoints.append(corners2)
                 ret2, rvec, tvec = cv2.solvePnP(objp, corners2, self.new_cameraMatrix, self.distMatrix)
                 if ret2:
-                    distance = math.sqrt(tvec[0]*tvec[0] + tvec[1]*tvec[1] + tvec[2]*tvec[2])
-                    #
-                    #   Indexnummern der Punkte in imgpoints bei 9x7 Schachbrett
-                    #   Kann auch rotiert oder gespiegelt auftreten
-                    #   42  36  30  24  18  12  6   0
-                    #   43  37  31  25  19  13  7   1
-                    #   44  38  32  26  20  14  8   2
-                    #   45  39  33  27  21  15  9   3
-                    #   46  40  34  28  22  16  10  4
-                    #   47  41  35  29  23  17  11  5
-                    #
-                    x1, y1 = imgpoints[0][0][0]
-                    x2, y2 = imgpoints[0][5][0]
-                    length_px_v = math.sqrt((x1-x2)*(x1-x2) + (y1-y2)*(y1-y2))
-                    x3, y3 = imgpoints[0][42][0]
-                    length_px_h = math.sqrt((x1-x3)*(x1-x3) + (y1-y3)*(y1-y3))
-                    length_v_mm = 5 * self.chessboardSize
-                    length_h_mm = 7 * self.chessboardSize
-                    mm_px_ratio_v = length_v_mm/length_px_v
-                    mm_px_ratio_h = length_h_mm/length_px_h
-                    mm_px_ratio = (mm_px_ratio_v + mm_px_ratio_h) /2
+                    distance = float(np.linalg.norm(tvec))
+                    homography, residuals = self._fitPxToMmHomography(corners2, objp[:, :2], patternSize)
+                    if homography is None:
+                        return False
                     self.objectDistance = distance
-                    self.mmPerPxRatio = mm_px_ratio
+                    self.pxToMmHomography = homography
+                    self.homographyResiduals = residuals
+                    #mean spacing of neighbouring corners, used for single measurements like diameters
+                    self.mmPerPxRatio = residuals['mm_per_px']
                     return True
                 else:
                     raise NoChessboardException()
         except Exception as e:
             return False
 
+    def _fitPxToMmHomography(self, corners, boardPoints, patternSize):
+        """fits a homography from image pixels to the chessboard plane in mm over all detected corners (least squares).
+        the board plane is rotated or mirrored onto the image axes and placed so that a point near the chessboard keeps
+        its pixel coordinates times the mm per pixel ratio, so the result has the same orientation as the image
+
+        Args:
+            corners (ndarray): detected corners as NumPy ndarray with shape (n, 1, 2)
+            boardPoints (ndarray): positions of the corners on the chessboard in mm with shape (n, 2)
+            patternSize (tuple): number of inner chessboard rows and columns
+
+        Returns:
+            tuple: 3x3 homography (pixel to mm) and dictionary with mm per pixel ratio, rms and max residual in mm and residual per corner in mm,
+                None and None if no homography was found
+        """
+        imagePoints = corners.reshape(-1, 2).astype(np.float64)
+        boardPoints = boardPoints.reshape(-1, 2).astype(np.float64)
+        boardHomography, _ = cv2.findHomography(imagePoints, boardPoints, 0)
+        if boardHomography is None:
+            return None, None
+        grid = imagePoints.reshape(patternSize[1], patternSize[0], 2)
+        spacing = np.concatenate((np.linalg.norm(np.diff(grid, axis=0), axis=2).ravel(), np.linalg.norm(np.diff(grid, axis=1), axis=2).ravel()))
+        mmPerPx = float(self.chessboardSize / np.mean(spacing))
+        #orthogonal procrustes: rotation or reflection that best aligns the board axes with the image axes
+        mapped = cv2.perspectiveTransform(imagePoints.reshape(-1, 1, 2), boardHomography).reshape(-1, 2)
+        imageCenter = imagePoints.mean(axis=0)
+        boardCenter = mapped.mean(axis=0)
+        u, _, vt = np.linalg.svd((imagePoints - imageCenter).T @ (mapped - boardCenter))
+        rotation = u @ vt
+        alignment = np.eye(3)
+        alignment[:2, :2] = rotation
+        alignment[:2, 2] = imageCenter * mmPerPx - rotation @ boardCenter
+        homography = alignment @ boardHomography
+        homography /= homography[2, 2]
+        residual = np.linalg.norm(mapped - boardPoints, axis=1)
+        residuals = {
+            'mm_per_px': mmPerPx,
+            'rms': float(np.sqrt(np.mean(residual * residual))),
+            'max': float(np.max(residual)),
+            'per_corner': residual
+        }
+        return homography, residuals
+
     def equalizeHistory(self, image):
         """equalizes the history of an image
 
@@ -681,7 +1272,7 @@ class DataModel(QObject):
 
     def findContours(self):
         """detects contours in an binarized image,
-        calculates area perimeter, center of contour and stores in a list of dictionaries
+        calculates area perimeter, center of contour and stores them in a contour table
 
         Raises:
             MissingInputException: if no binarized image saved previously
@@ -695,11 +1286,30 @@ class DataModel(QObject):
             showImages = False
         else:
             showImages = True
-        cont = cv2.findContours(self.binarizedImage, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+        areaThreshold_Low = self.scaleFactor * 500
+        areaThreshold_High = self.scaleFactor * 1000000
+        binarizedImage = self.binarizedImage
+        if self.contourPrefilter:
+            binarizedImage = self._prefilterComponents(binarizedImage, areaThreshold_Low)
+        start = time.perf_counter()
+        cont = cv2.findContours(binarizedImage, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+        if self.contourPrefilterStats is not None:
+            self.contourPrefilterStats['trace_time'] = time.perf_counter() - start
+            if self.debugMode:
+                #trace the unfiltered image once more to measure the time saved
+                start = time.perf_counter()
+                unfiltered = cv2.findContours(self.binarizedImage, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)[0]
+                self.contourPrefilterStats['unfiltered_trace_time'] = time.perf_counter() - start
+                self.contourPrefilterStats['unfiltered_contours'] = len(unfiltered)
+                self.contourPrefilterStats['time_saved'] = self.contourPrefilterStats['unfiltered_trace_time'] - self.contourPrefilterStats['trace_time'] - self.contourPrefilterStats['prefilter_time']
         contours = cont[0]
         hierarchy = cont[1]
+        if self.isSparseUndistortion():
+            #image was not undistorted, map the contour points only
+            contours = self._undistortContours(contours)
         
         if showImages:
+            #in sparse undistortion mode the traced contours are drawn on the distorted image, so no image is remapped
             cont_img = copy.copy(self.originalImage)
             target_exists = True
         else:
@@ -707,57 +1317,41 @@ class DataModel(QObject):
         if self.generateMask == True:
             height, width = self.binarizedImage.shape
             mask_img = np.zeros((width, height), dtype='uint8')
-        contoursList = []
-        index_counter = 0
-        areaThreshold_Low = self.scaleFactor * 500
-        areaThreshold_High = self.scaleFactor * 1000000
-        for c in contours:
-            #calculate area
-            area = cv2.contourArea(c)
-            #sort out very small areas (=interference)
-            if (area > areaThreshold_Low) and (area < areaThreshold_High):
-                #calculate smallest surrounding rectangle
-                x, y, w, h = cv2.boundingRect(c)
-                middle_x_rect = x + (w/2)
-                middle_y_rect = y + (h/2)
-                #calculate center of area with moments
-                M = cv2.moments(c)
-                cx_moment = M['m10'] / M['m00']
-                cy_moment = M['m01'] / M['m00']
-                #calculate arithmetic mean of center
-                mean_cx = int(((middle_x_rect + cx_moment) / 2) + 0.5)
-                mean_cy = int(((middle_y_rect + cy_moment) / 2) + 0.5)
-                #calculate perimeter
-                perimeter = cv2.arcLength(c, True)
-                dict = {
-                    'contour_index': index_counter,
-                    'contour_points_px': c,
-                    'contour_points_ref': None,
-                    'contour_points_mm': None,
-                    'contour_center_px': (mean_cx,mean_cy),
-                    'contour_area_px': area,
-                    'contour_perimeter_px': perimeter,
-                    'contour_is_hole': None,
-                    'center_point_ref': None,
-                    'center_point_ref_mm': None,
-                    'roundness': None,
-                    'diameter_px': None,
-                    'diameter_mm': None,
-                    'deviation_px': None,
-                    'deviation_mm': None,
-                    'set_diameter_manually': False
-                }
-                contoursList.append(dict)
-                index_counter += 1
-                if target_exists:
-                    #draw rectangle around contour
-                    cv2.rectangle(cont_img, (x, y), (x+w, y+h), (0, 128, 255), 2)
-                    #highlight contour outline
-                    cv2.drawContours(cont_img, [c], -1, (36, 255, 12), 3)
-                if self.generateMask == True:
-                    cv2.drawContours(mask_img, [c], -1, 255, 1)
-        for cont in contoursList:
-            self._calcRoundness(contourFromList=cont)
+        contoursList = ContourTable.fromContours(contours)
+        features = self._calcContourFeatures(contoursList)
+        #sort out very small areas (=interference)
+        selected = (features['area'] > areaThreshold_Low) & (features['area'] < areaThreshold_High)
+        selected, parents, depth, outerBorder = self._resolveContourHierarchy(hierarchy, selected, features)
+        contoursList = contoursList.select(selected)
+        contoursList.setColumn('contour_index', np.arange(len(contoursList)))
+        contoursList.setColumn('contour_parent_index', parents)
+        contoursList.setColumn('contour_depth', depth)
+        #the outer border of a part with holes, a hole with something inside stays a hole border
+        hasChildren = np.bincount(parents[parents >= 0], minlength=len(contoursList)) > 0
+        contoursList.setColumn('contour_is_outline', outerBorder & hasChildren)
+        bbox = features['bbox'][selected]
+        #arithmetic mean of the middle of the smallest surrounding rectangle and the center of area
+        middle_rect = bbox[:, :2] + bbox[:, 2:] / 2
+        mean_center = np.floor((middle_rect + features['centroid'][selected]) / 2 + 0.5)
+        contoursList.setColumn('contour_center_px', mean_center)
+        contoursList.setColumn('contour_area_px', features['area'][selected])
+        contoursList.setColumn('contour_perimeter_px', features['perimeter'][selected])
+        self._calcRoundnessColumns(contoursList)
+        self._calcCircleColumns(contoursList)
+        if target_exists or self.generateMask == True:
+            selectedContours = contoursList.getContours()
+        if target_exists:
+            drawnContours, drawnBoxes = selectedContours, bbox
+            if self.isSparseUndistortion():
+                drawnContours = [cont[0][i] for i in np.flatnonzero(selected)]
+                drawnBoxes = [cv2.boundingRect(contour) for contour in drawnContours]
+            for x, y, w, h in drawnBoxes:
+                #draw rectangle around contour
+                cv2.rectangle(cont_img, (int(x), int(y)), (int(x+w), int(y+h)), (0, 128, 255), 2)
+            #highlight contour outline
+            cv2.drawContours(cont_img, drawnContours, -1, (36, 255, 12), 3)
+        if self.generateMask == True:
+            cv2.drawContours(mask_img, selectedContours, -1, 255, 1)
         if target_exists:
             cont_img = self._scaleImageForScreen(cont_img)
             cv2.imshow('Contours image', cont_img)
@@ -766,8 +1360,104 @@ class DataModel(QObject):
         if self.generateMask == True:
             self.mask = mask_img
         self.contoursList = contoursList
+        self.derivedCoordinatesKeys = {}
+        self.undistortionComparison = None
         return True
 
+    def _prefilterComponents(self, binarizedImage, areaThreshold):
+        """removes connected components whose contours can not reach the area threshold before the contours are traced.
+        the area of a contour is at most the area of the rectangle around the pixel centers of its component,
+        so components with a smaller rectangle (=interference) are removed without changing any contour that passes the area filter
+
+        Args:
+            binarizedImage (ndarray): binarized image as uint8 NumPy ndarray
+            areaThreshold (float): smallest contour area that is kept
+
+        Returns:
+            ndarray: binarized image without the removed components, the given image if nothing was removed
+        """
+        start = time.perf_counter()
+        if self.isSparseUndistortion():
+            #areas change when the contour points are undistorted, keep a margin
+            areaThreshold = areaThreshold * 0.5
+        #8-connected like the outer borders traced by cv2.findContours
+        numLabels, labels, stats, _ = cv2.connectedComponentsWithStats(binarizedImage, connectivity=8)
+        x, y = stats[:, cv2.CC_STAT_LEFT], stats[:, cv2.CC_STAT_TOP]
+        w, h = stats[:, cv2.CC_STAT_WIDTH], stats[:, cv2.CC_STAT_HEIGHT]
+        keep = (w - 1) * (h - 1) > areaThreshold
+        keep[0] = False#background
+        survivors = np.flatnonzero(keep)
+        culled = numLabels - 1 - len(survivors)
+        if culled == 0:
+            filtered = binarizedImage
+        else:
+            #the few remaining components are copied within their bounding boxes
+            filtered = np.zeros_like(binarizedImage)
+            for label in survivors:
+                rows = slice(y[label], y[label] + h[label])
+                cols = slice(x[label], x[label] + w[label])
+                np.bitwise_or(filtered[rows, cols], cv2.compare(labels[rows, cols], int(label), cv2.CMP_EQ), out=filtered[rows, cols])
+        self.contourPrefilterStats = {
+            'components': int(numLabels - 1),
+            'culled': int(culled),
+            'prefilter_time': time.perf_counter() - start
+        }
+        return filtered
+
+    def compareSparseUndistortion(self):
+        """compares the contours found in sparse undistortion mode with the contours found
+        in the undistorted and cropped binary image, like it is done when the whole image is undistorted.
+        every sparse contour is matched with the dense contour with the nearest center, all contours are compared at once.
+        contours without a dense contour within maxComparisonOffset (e.g. cut by the crop) are counted as unmatched.
+        the whole image is remapped and traced again, so the comparison is only run on request
+
+        Raises:
+            MissingInputException: raised when no contours or binary image found
+
+        Returns:
+            dict: number of matched and unmatched contours, mean and max center offset in px and mean and max relative area difference
+                  of the matched contours, None if no contours to compare
+        """
+        if self.contoursList is None or self.binarizedImage is None:
+            raise MissingInputException()
+        #remap tables of the dense path, restored afterwards because the sparse mode does not use them
+        undistortMode = self.undistortMode
+        self.undistortMode = 1
+        try:
+            denseBinary, _ = self.undistortAndCropImage(image=self.binarizedImage)
+        finally:
+            self.undistortMode = undistortMode
+        denseBinary = cv2.threshold(denseBinary, 127, 255, cv2.THRESH_BINARY)[1]
+        denseContours = cv2.findContours(denseBinary, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)[0]
+        dense = self._calcContourFeatures(ContourTable.fromContours(denseContours))
+        sparse = self._calcContourFeatures(self.contoursList)
+        #interference of the dense image is not matched
+        denseValid = dense['area'] > self.scaleFactor * 500 / 2
+        sparseValid = sparse['area'] > 0
+        if not denseValid.any() or not sparseValid.any():
+            return None
+        denseCenters = dense['centroid'][denseValid]
+        denseAreas = dense['area'][denseValid]
+        centers = sparse['centroid'][sparseValid]
+        areas = self.contoursList.columns['contour_area_px'][sparseValid]
+        #distances between all sparse and dense centers at once
+        distances = np.hypot(centers[:, None, 0] - denseCenters[None, :, 0], centers[:, None, 1] - denseCenters[None, :, 1])
+        nearest = np.argmin(distances, axis=1)
+        offsets = distances[np.arange(len(centers)), nearest]
+        matched = offsets <= self.maxComparisonOffset
+        offsets = offsets[matched]
+        nearest = nearest[matched]
+        areaDifferences = np.abs(areas[matched] - denseAreas[nearest]) / denseAreas[nearest]
+        self.undistortionComparison = {
+            'contours': len(offsets),
+            'unmatched': int(np.count_nonzero(~matched)),
+            'mean_center_offset_px': float(np.mean(offsets)) if len(offsets) > 0 else None,
+            'max_center_offset_px': float(np.max(offsets)) if len(offsets) > 0 else None,
+            'mean_area_difference': float(np.mean(areaDifferences)) if len(offsets) > 0 else None,
+            'max_area_difference': float(np.max(areaDifferences)) if len(offsets) > 0 else None
+        }
+        return self.undistortionComparison
+
     def findObjectCenter(self):
         """tries to detect the center of an object image by cutting out everything but the center region of the image and applying hough circle algorithm
         intended to find the center of the crankshaft
@@ -813,7 +1503,7 @@ class DataModel(QObject):
                 cv2.destroyAllWindows()
             img_center_x = img_center_x + offset_h
             img_center_y = img_center_y + offset_v
-            middlePoint = (img_center_x, img_center_y)
+            middlePoint = self.undistortImagePoint((img_center_x, img_center_y))
             return middlePoint
         else:
             raise NoFormException()
@@ -871,6 +1561,8 @@ class DataModel(QObject):
 
     def transformContoursList(self):
         """transforms coordinates in the list with the saved contours matching a new reference point
+        and prepares the transforms from pixel to mm and cad coordinates.
+        the pixel coordinates are not changed, calling it again with the same reference point does nothing
 
         Raises:
             MissingInputException: raised when no contours list or reference point was found
@@ -881,16 +1573,15 @@ class DataModel(QObject):
         if self.contoursList == None or len(self.contoursList) == 0 or self.referencePoint == None:
             raise MissingInputException()
         else:
-            for cont in self.contoursList:
-                new_middle = self._pointTransformCoordinateSystem(point=cont['contour_center_px'])
-                cont.update({'center_point_ref': new_middle})
-                contPointList = cont['contour_points_px']
-                for i in range(len(contPointList)):
-                    (old_x, old_y) = contPointList[i][0]
-                    old_point = (old_x, old_y)
-                    new_point = self._pointTransformCoordinateSystem(point=old_point)
-                    contPointList[i][0] = new_point
-                cont.update({'contour_points_ref': contPointList})
+            key = tuple(self.referencePoint)
+            if self.derivedCoordinatesKeys.get('contour_points_ref') != key:
+                reference = np.array(self.referencePoint, dtype=np.int32)
+                table = self.contoursList
+                table.setColumn('center_point_ref', table.columns['contour_center_px'] - reference)
+                table.setPoints('contour_points_ref', table.points['contour_points_px'] - reference)
+                table.points['contour_points_ref'].setflags(write=False)
+                self.derivedCoordinatesKeys['contour_points_ref'] = key
+            self._updateCoordinateTransforms()
             return True
 
     #creates a dxf drawing with all found contours
@@ -907,8 +1598,8 @@ class DataModel(QObject):
         if self.contoursList == None or len(self.contoursList) == 0:
             raise MissingInputException()
         try:
-            #flig y axis because cv2 and dxf dirextions are opposite
-            self._flipYAxis()
+            #cv2 and dxf y-axis directions are opposite, the cad transform flips the y-axis
+            self._convertContoursListToCAD()
             #create a new DXF drawing
             #official version name: 'AC1024'
             doc = ezdxf.new('R2010')
@@ -920,12 +1611,9 @@ class DataModel(QObject):
             for cont in self.contoursList:
                 if cont['contour_is_hole']:
                     radius = cont['diameter_mm']/2
-                    msp.add_circle(cont['center_point_ref_mm'], radius, dxfattribs={'layer': 'HoleLayer'})
+                    msp.add_circle(cont['center_point_cad'], radius, dxfattribs={'layer': 'HoleLayer'})
                 else:
-                    list = []
-                    for i in range(len(cont['contour_points_mm'])):
-                        x, y = cont['contour_points_mm'][i]
-                        list.append((x, y))
+                    list = cont['contour_points_cad'].tolist()
                     list.append(list[0])    #close perimeter line of contour
                     msp.add_lwpolyline(list, dxfattribs={'layer': 'ContourLayer'})
             if self.manufacturer == None or self.modelName == None:
@@ -981,12 +1669,12 @@ class DataModel(QObject):
                 return False
 
     def loadCalImagesFromDirectory(self):
-        """opens dialog to select a directory , then loads all images in directory as calibration images.
-        images will be scaled with saved factor.
-        showing loaded images is optional.
+        """opens dialog to select a directory, then stores all images in directory as calibration images.
+        images are decoded while calculating the calibration data, so only the file list is kept.
+        showing images is optional, they are decoded and scaled with saved factor for that
 
         Returns:
-            bool: True when no error occured, else False
+            bool: True when at least 10 images were found, else False
         """
         if self.scaleFactor == None:
             self.scaleFactor = 1.0
@@ -996,22 +1684,21 @@ class DataModel(QObject):
             showImages = True
         files = self._openFileDirectory('jpg')
         if files:
-            temp_images = []
-            for fname in files:
-                try:
-                    img = cv2.imread(fname)
-                    if self.scaleFactor != 1.0:
-                        img = cv2.resize(img, None, fx=self.scaleFactor, fy=self.scaleFactor, interpolation=cv2.INTER_CUBIC)
-                    temp_images.append(img)
-                    if showImages:
-                        temp = self._scaleImageForScreen(img)
-                        cv2.imshow('', temp)
-                        cv2.waitKey(self.showImagesDuration)
-                        cv2.destroyAllWindows()
-                except Exception as e:
-                    return False
-            if len(temp_images) >= 10:
-                self.calibrationImages = temp_images
+            files = sorted(files)
+            if showImages:
+                for fname in files:
+                    try:
+                        img, _ = self._readImageScaled(fname)
+                    except Exception as e:
+                        continue
+                    temp = self._scaleImageForScreen(img)
+                    cv2.imshow('', temp)
+                    cv2.waitKey(self.showImagesDuration)
+                    cv2.destroyAllWindows()
+            if len(files) >= 10:
+                self.calibrationFiles = files
+                self.calibrationImages = None
+                self.calibrationImageSize = None
                 return True
             else:
                 return False
@@ -1034,9 +1721,7 @@ class DataModel(QObject):
         file = self._openFile(self.data_subdir, 'image')
         if file:
             try:
-                img = cv2.imread(file)
-                if self.scaleFactor != 1.0:
-                    img = cv2.resize(img, None, fx=self.scaleFactor, fy=self.scaleFactor, interpolation=cv2.INTER_CUBIC)
+                img, self.imageLoadStats = self._readImageScaled(file)
                 if showImages:   
                     temp = self._scaleImageForScreen(img) 
                     cv2.imshow('Loaded image', temp)
@@ -1062,7 +1747,7 @@ class DataModel(QObject):
         filename = self._generateReferenceFilename()
         self._convertContoursListToMM()
         if self.threeChannelGrayImage is None:
-            image = copy.copy(self.originalImage)
+            image = copy.copy(self.getObjectImageForDrawing())
             image_single_channel = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
             self.threeChannelGrayImage = cv2.merge((image_single_channel, image_single_channel, image_single_channel))
         image = copy.copy(self.threeChannelGrayImage)
@@ -1104,7 +1789,7 @@ class DataModel(QObject):
                         line = '\n' + str(key) + '(length)\t' + str(len(cont[key]))
                     elif  key == 'contour_points_ref':
                         line = '\n' + str(key) + '(length)\t' + str(len(cont[key]))
-                    elif key ==  'contour_points_mm':
+                    elif key ==  'contour_points_mm' or key == 'contour_points_cad':
                         if cont[key] is not None:
                             line = '\n' + str(key) + '(length)\t' + str(len(cont[key]))
                         else:
@@ -1133,12 +1818,29 @@ class DataModel(QObject):
         file.write(line)
         line = '\nImage resolution (after crop): ' + str(self.originalImageSize_afterCrop)
         file.write(line)
+        if self.imageLoadStats is not None:
+            line = '\nImage decode time [s]: ' + str(round(self.imageLoadStats['decode_time'], 3))
+            file.write(line)
+            line = '\nPeak memory usage [MB]: ' + str(self._formatMemory(self.imageLoadStats['peak_memory']))
+            file.write(line)
         line = '\nChessboard size: ' + str(self.chessboardColumns) + 'x' + str(self.chessboardRows)
         file.write(line)
         line = '\nChessboard square size: ' + str(self.chessboardSize)
         file.write(line)
         line = '\nmm/Pixel ratio: ' + str(self.mmPerPxRatio)
         file.write(line)
+        if self.contourPrefilterStats is not None:
+            stats = self.contourPrefilterStats
+            line = '\nRemoved components before contour tracing: ' + str(stats['culled']) + ' of ' + str(stats['components'])
+            file.write(line)
+            line = '\nPrefilter/ contour tracing time [s]: ' + str(round(stats['prefilter_time'], 3)) + '/' + str(round(stats['trace_time'], 3))
+            file.write(line)
+            if 'time_saved' in stats:
+                line = '\nContour tracing time saved by prefilter [s]: ' + str(round(stats['time_saved'], 3))
+                file.write(line)
+        if self.homographyResiduals is not None:
+            line = '\nPixel to mm homography residual (rms/max) [mm]: ' + str(round(self.homographyResiduals['rms'], 4)) + '/' + str(round(self.homographyResiduals['max'], 4))
+            file.write(line)
         line = '\nMean error: ' + str(self.meanError)
         file.write(line)
         line = '\nDistance to object: ' + str(self.objectDistance)
@@ -1147,8 +1849,15 @@ class DataModel(QObject):
         file.write(line)
         line = '\nRoundness threshold: ' + str(self.roundnessThreshold)
         file.write(line)
+        line = '\nMaximum width of duplicate ring edges (mm): ' + str(self.maxRingWidth)
+        file.write(line)
         line = '\nBinary image morphology operation mode: ' + str(self.morph_options[self.morphMode])
         file.write(line)
+        line = '\nUndistortion mode: ' + str(self.undistort_options[self.undistortMode])
+        file.write(line)
+        if self.undistortionComparison is not None:
+            line = '\nSparse undistortion comparison: ' + str(self.undistortionComparison)
+            file.write(line)
         
         file.close()
         cv2.imwrite(filepath, image)
@@ -1258,34 +1967,63 @@ class DataModel(QObject):
         return True
 
     def createRefImageHSVRange(self):
-        """generates a reference image for selecting the correct hsv value threshold
+        """returns a reference image for selecting the correct hsv value threshold.
+        the image is generated once and cached in memory and in the res directory.
+        a cached image of another version or size than the generated layout is replaced
+
+        Returns:
+            ndarray: reference image as NumPy ndarray
+        """
+        if self.hsvReferenceImage is not None:
+            return self.hsvReferenceImage
+        filepath = self.res_subdir + '/hsv_reference_v' + str(self.hsvReferenceVersion) + '.png'
+        image = cv2.imread(filepath) if os.path.isfile(filepath) else None
+        if image is not None and image.shape != self._getRefImageHSVRangeShape():
+            image = None
+        if image is None:
+            image = self._generateRefImageHSVRange()
+            #the image is generated again on the next start if it could not be cached
+            cv2.imwrite(filepath, image)
+        self.hsvReferenceImage = image
+        return image
+
+    def _getRefImageHSVRangeLayout(self):
+        """returns the layout of the hsv reference image
+
+        Returns:
+            tuple: height and width of the color area, vertical and horizontal margin in pixel
+        """
+        return 256, 540, 56, 90
+
+    def _getRefImageHSVRangeShape(self):
+        """returns the shape of the hsv reference image resulting from its layout
+
+        Returns:
+            tuple: height, width and number of channels of the reference image
+        """
+        height, width, margin_v, margin_h = self._getRefImageHSVRangeLayout()
+        return (height + 2 * margin_v, width + 2 * margin_h, 3)
+
+    def _generateRefImageHSVRange(self):
+        """generates the reference image for selecting the correct hsv value threshold,
+        the colors of all pixels are converted with one call of cv2.cvtColor
 
         Returns:
             ndarray: reference image as NumPy ndarray
         """
-        height = 256
-        width = 540
-        margin_v = 56
-        margin_h = 90
-        blank_image = np.zeros(((height+2*margin_v), (width+2*margin_h), 3), np.uint8)
-        hue = 0
-        saturation = 0
+        height, width, margin_v, margin_h = self._getRefImageHSVRangeLayout()
+        blank_image = np.zeros(self._getRefImageHSVRangeShape(), np.uint8)
         value = 255
-        #iterate through pixels of blank image and set incrementing hue val for x-axis
-        #and incrementing saturation value on y-axis
-        for angle in range(margin_h, width+margin_h, 1):
-            for saturation in range(margin_v, height+margin_v, 1):
-                hsv_val = np.uint8([[[hue, saturation-margin_v, value]]])
-                bgr_val = cv2.cvtColor(hsv_val, cv2.COLOR_HSV2BGR)
-                blank_image[saturation, angle] = bgr_val[0]
-                #tick marks y-axis
-                if (saturation-margin_v) % 50 == 0 and saturation > 0:
-                    cv2.line(blank_image, (margin_h-5, saturation), (margin_h+5, saturation), (255, 255, 255), 1)
-            #tick marks x-axis
-            if (angle-margin_h) % 30 == 0 and angle > 0:
-                cv2.line(blank_image, (angle, margin_v+height-5), (angle, margin_v+height+5), (255, 255, 255), 1)
-            if (angle-margin_h) % 3 == 0 and angle > 0:
-                hue += 1
+        #incrementing hue value on x-axis (3 pixels per value) and incrementing saturation value on y-axis
+        hue, saturation = np.meshgrid((np.arange(width) + 2) // 3, np.arange(height))
+        hsv_grid = np.dstack((hue, saturation, np.full((height, width), value))).astype(np.uint8)
+        blank_image[margin_v:margin_v+height, margin_h:margin_h+width] = cv2.cvtColor(hsv_grid, cv2.COLOR_HSV2BGR)
+        #tick marks y-axis
+        for saturation in range(0, height, 50):
+            cv2.line(blank_image, (margin_h-5, margin_v+saturation), (margin_h+5, margin_v+saturation), (255, 255, 255), 1)
+        #tick marks x-axis
+        for angle in range(0, width, 30):
+            cv2.line(blank_image, (margin_h+angle, margin_v+height-5), (margin_h+angle, margin_v+height+5), (255, 255, 255), 1)
         #x axis
         cv2.line(blank_image, (margin_h+width, margin_v+height-5), (margin_h+width, margin_v+height+5), (255, 255, 255), 1)
         cv2.line(blank_image, (margin_h-15,margin_v+height), (margin_h+width+15, margin_v+height), (255, 255, 255), 2)
@@ -1326,66 +2064,247 @@ class DataModel(QObject):
             full_filename = self.manufacturer + self.modelName + '_' + filename
             return full_filename
 
-    def _calcRoundness(self, contourFromList=None):
-        """calculates the roundness as diameter ratio of an found contour as indicator whether it is a drill hole or not
-        also calculates average diameter in pixel and mm and the deviation between to diameters as indicator for the quality of a measurement
+    def _calcContourFeatures(self, contoursList):
+        """calculates area, perimeter, smallest surrounding rectangle and center of area of all contours at once
+        from the flat point buffer of the contour table. same results as cv2.contourArea, cv2.arcLength, cv2.boundingRect
+        and the center of cv2.moments
+
+        Args:
+            contoursList (ContourTable): table with the contours
+
+        Returns:
+            dict: area, perimeter, bounding box (x, y, w, h) and centroid (x, y) per contour as NumPy ndarrays
+        """
+        points = contoursList.points['contour_points_px'].astype(np.float64)
+        starts = contoursList.offsets[:-1]
+        if len(starts) == 0:
+            return {'area': np.zeros(0), 'perimeter': np.zeros(0), 'bbox': np.zeros((0, 4), dtype=np.int32), 'centroid': np.zeros((0, 2))}
+        #index of the following point, the last point of a contour is followed by its first point
+        following = np.arange(1, len(points) + 1)
+        following[contoursList.offsets[1:] - 1] = starts
+        x, y = points[:, 0], points[:, 1]
+        x_next, y_next = x[following], y[following]
+        #shoelace formula
+        cross = x * y_next - x_next * y
+        signedArea = np.add.reduceat(cross, starts) / 2
+        perimeter = np.add.reduceat(np.hypot(x_next - x, y_next - y), starts)
+        x_min = np.minimum.reduceat(x, starts)
+        y_min = np.minimum.reduceat(y, starts)
+        x_max = np.maximum.reduceat(x, starts)
+        y_max = np.maximum.reduceat(y, starts)
+        bbox = np.stack((x_min, y_min, x_max - x_min + 1, y_max - y_min + 1), axis=1).astype(np.int32)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            centroid = np.stack((np.add.reduceat((x + x_next) * cross, starts), np.add.reduceat((y + y_next) * cross, starts)), axis=1) / (6 * signedArea[:, None])
+        return {'area': np.abs(signedArea), 'perimeter': perimeter, 'bbox': bbox, 'centroid': centroid}
+
+    def _resolveContourHierarchy(self, hierarchy, selected, features):
+        """resolves the hierarchy of the selected contours in one pass over the hierarchy of cv2.findContours.
+        the parent of a contour is its nearest selected surrounding contour. the inner edge of a ring
+        not wider than maxRingWidth (e.g. a drawn line) is a duplicate of its outer edge and gets removed
 
         Args:
-            contourFromList (dictionary): dictionary with all information regarding a single contour
+            hierarchy (ndarray): hierarchy as returned by cv2.findContours with cv2.RETR_TREE, None if no contours found
+            selected (ndarray): boolean mask of the contours that passed the area filter
+            features (dict): area and perimeter of all contours
 
         Raises:
-            MissingInputException: raised when no contour dictionary provided
+            MissingInputException: raised when the mm/px ratio was not calculated
 
         Returns:
-            bool: True when finished
+            tuple: boolean mask of the kept contours, index of the parent and depth of every kept contour in the kept contours
+            and whether a kept contour is the outer border of a white area (otherwise it is the border of a hole in a white area)
         """
-        if contourFromList == None:
+        if self.mmPerPxRatio == None:
             raise MissingInputException()
-        else:
-            area = contourFromList['contour_area_px']
-            perimeter = contourFromList['contour_perimeter_px']
-            #calculate roundness
-            d_area = round(math.sqrt(4 * area / math.pi), 2)
-            d_perimeter = round(perimeter / math.pi, 2)
-            #the nearer the ratio is to 1 the greater is the roundness
-            diameter_ratio = round(d_area/d_perimeter, 2)
-            average_diameter = round((d_area + d_perimeter) / 2, 2)
-            average_diameter_mm = round(self._convertToMM(measure=average_diameter), 2)
-            deviation_area = round(abs(average_diameter - d_area), 2)
-            deviation_perimeter = round(abs(average_diameter - d_perimeter), 2)
-            if deviation_area > deviation_perimeter:
-                maxDeviation = deviation_area
-            else:
-                maxDeviation = deviation_perimeter
-            maxDeviation_mm = round(self._convertToMM(measure=maxDeviation), 2)
-            if diameter_ratio >= self.roundnessThreshold:
-                isHole = True
-            else:
-                isHole = False
-            contourFromList.update({'roundness': diameter_ratio})
-            contourFromList.update({'diameter_px': average_diameter})
-            contourFromList.update({'diameter_px': maxDeviation})
-            contourFromList.update({'diameter_mm': average_diameter_mm})
-            contourFromList.update({'deviation_mm': maxDeviation_mm})
-            contourFromList.update({'contour_is_hole': isHole})
-            return True
+        if hierarchy is None or not selected.any():
+            count = int(np.count_nonzero(selected))
+            return selected, np.full(count, -1, dtype=np.int32), np.zeros(count, dtype=np.int32), np.ones(count, dtype=bool)
+        parent = hierarchy.reshape(-1, 4)[:, 3]
+        #outer borders and hole borders alternate in the hierarchy
+        rawDepth = np.zeros(len(parent), dtype=np.int32)
+        ancestor = parent.copy()
+        while (ancestor >= 0).any():
+            rawDepth += ancestor >= 0
+            ancestor = np.where(ancestor >= 0, parent[ancestor], -1)
+        nearest = self._nearestSelectedAncestor(parent, selected)
+        #ring width from the area between both edges and their average perimeter
+        area, perimeter = features['area'], features['perimeter']
+        hasParent = nearest >= 0
+        ringWidth = np.full(len(parent), np.inf)
+        ringWidth[hasParent] = 2 * (area[nearest[hasParent]] - area[hasParent]) / (perimeter[nearest[hasParent]] + perimeter[hasParent])
+        #the physical width is converted with the calibrated ratio, so it does not depend on scale factor or object distance
+        duplicate = selected & (ringWidth <= self.maxRingWidth / self.mmPerPxRatio)
+        kept = selected & ~duplicate
+        if duplicate.any():
+            nearest = self._nearestSelectedAncestor(parent, kept)
+        #index of every contour in the kept contours
+        newIndex = np.cumsum(kept) - 1
+        parents = np.where(nearest >= 0, newIndex[nearest], -1)[kept].astype(np.int32)
+        depth = np.zeros(len(parents), dtype=np.int32)
+        ancestor = parents.copy()
+        while (ancestor >= 0).any():
+            depth += ancestor >= 0
+            ancestor = np.where(ancestor >= 0, parents[ancestor], -1)
+        return kept, parents, depth, rawDepth[kept] % 2 == 0
+
+    def _nearestSelectedAncestor(self, parent, selected):
+        """returns the nearest selected surrounding contour of every contour
 
-    def _convertToMM(self, measure=None):
-        """converts a given measurement from pixel to mm
+        Args:
+            parent (ndarray): index of the parent of every contour, -1 if there is none
+            selected (ndarray): boolean mask of the selected contours
+
+        Returns:
+            ndarray: index of the nearest selected ancestor of every contour, -1 if there is none
+        """
+        ancestor = parent.copy()
+        pending = ancestor >= 0
+        pending[pending] = ~selected[ancestor[pending]]
+        while pending.any():
+            ancestor[pending] = parent[ancestor[pending]]
+            pending = ancestor >= 0
+            pending[pending] = ~selected[ancestor[pending]]
+        return ancestor
+
+    def _calcRoundnessColumns(self, contoursList):
+        """calculates the roundness as diameter ratio of all contours as indicator whether it is a drill hole or not
+        also calculates average diameter in pixel and mm and the deviation between to diameters as indicator for the quality of a measurement.
+        outlines surround other contours and can not be holes, their values stay empty
 
         Args:
-            measure (float): value of the measurement that needs to be converted
+            contoursList (ContourTable): table with area, perimeter and outline flag of all contours
 
         Raises:
-            MissingInputException: raised when no measurement given
+            MissingInputException: raised when no contour table provided or the mm/px ratio was not calculated
 
         Returns:
-            float: measurement in mm
+            bool: True when finished
         """
-        if measure == None or self.mmPerPxRatio == None:
+        if contoursList is None or self.mmPerPxRatio == None:
             raise MissingInputException()
-        else:
-            return measure * self.mmPerPxRatio
+        candidates = ~contoursList.columns['contour_is_outline']
+        area = contoursList.columns['contour_area_px'][candidates]
+        perimeter = contoursList.columns['contour_perimeter_px'][candidates]
+        d_area = np.round(np.sqrt(4 * area / math.pi), 2)
+        d_perimeter = np.round(perimeter / math.pi, 2)
+        #the nearer the ratio is to 1 the greater is the roundness
+        diameter_ratio = np.round(d_area / d_perimeter, 2)
+        average_diameter = np.round((d_area + d_perimeter) / 2, 2)
+        deviation_area = np.round(np.abs(average_diameter - d_area), 2)
+        deviation_perimeter = np.round(np.abs(average_diameter - d_perimeter), 2)
+        maxDeviation = np.maximum(deviation_area, deviation_perimeter)
+        columns = {
+            'roundness': diameter_ratio,
+            'diameter_px': average_diameter,
+            'deviation_px': maxDeviation,
+            'diameter_mm': np.round(average_diameter * self.mmPerPxRatio, 2),
+            'deviation_mm': np.round(maxDeviation * self.mmPerPxRatio, 2)
+        }
+        for name, values in columns.items():
+            column = np.full(len(contoursList), np.nan)
+            column[candidates] = values
+            contoursList.setColumn(name, column)
+        isHole = np.zeros(len(contoursList), dtype=bool)
+        isHole[candidates] = diameter_ratio >= self.roundnessThreshold
+        contoursList.setColumn('contour_is_hole', isHole)
+        return True
+
+    def _calcCircleColumns(self, contoursList):
+        """fits a circle to every hole and replaces the diameters of the holes with the diameter of the circle.
+        the fit is not biased by the pixel grid like area and perimeter, so holes are measured sub-pixel accurate.
+        the diameter in mm is measured on the circle mapped with the same homography as the positions
+
+        Args:
+            contoursList (ContourTable): table with the hole flag of all contours
+
+        Returns:
+            bool: True when finished
+        """
+        holes = contoursList.columns['contour_is_hole'] == 1
+        center, radius, residual = self._fitCircles(contoursList.select(holes))
+        valid = np.isfinite(radius)
+        holes[holes] = valid
+        center, radius, residual = center[valid], radius[valid], residual[valid]
+        columns = {
+            'circle_center_px': (center, np.full((len(contoursList), 2), np.nan)),
+            'circle_radius_px': (radius, np.full(len(contoursList), np.nan)),
+            'circle_residual_px': (residual, np.full(len(contoursList), np.nan)),
+            'diameter_px': (np.round(2 * radius, 2), contoursList.columns['diameter_px'].copy()),
+            'diameter_mm': (np.round(self._mapCircleDiameters(center, radius), 2), contoursList.columns['diameter_mm'].copy())
+        }
+        for name, (values, column) in columns.items():
+            column[holes] = values
+            contoursList.setColumn(name, column)
+        return True
+
+    def _mapCircleDiameters(self, center, radius, directions=8):
+        """maps circles from pixels to mm and measures their diameters. with a homography the circle becomes an ellipse,
+        so the diameter is averaged over the distances of opposite circle points in several directions.
+        without homography the radius is scaled with the mm per pixel ratio
+
+        Args:
+            center (ndarray): centers (x, y) of the circles in pixel with shape (n, 2)
+            radius (ndarray): radii of the circles in pixel with shape (n)
+            directions (int, optional): number of measured diameters per circle. Defaults to 8.
+
+        Returns:
+            ndarray: mean diameter of every circle in mm
+        """
+        if self.pxToMmHomography is None:
+            return 2 * radius * self.mmPerPxRatio
+        angles = np.arange(directions) * math.pi / directions
+        offsets = radius[:, None, None] * np.stack((np.cos(angles), np.sin(angles)), axis=1)
+        #first and second half are the opposite points of each diameter
+        points = np.concatenate((center[:, None, :] + offsets, center[:, None, :] - offsets), axis=1)
+        mapped = self._transformPoints(points.reshape(-1, 2), self.pxToMmHomography).reshape(len(radius), 2 * directions, 2)
+        diameters = np.linalg.norm(mapped[:, :directions] - mapped[:, directions:], axis=2)
+        return diameters.mean(axis=1)
+
+    def _fitCircles(self, contoursList):
+        """fits a circle to every contour at once with the algebraic least squares fit by Kasa.
+        the sums of all contours are calculated from the flat point buffer, every contour is solved in closed form
+
+        Args:
+            contoursList (ContourTable): table with the contours
+
+        Returns:
+            tuple: center (x, y), radius and rms residual per contour as NumPy ndarrays, NaN if no circle can be fitted
+        """
+        starts = contoursList.offsets[:-1]
+        if len(starts) == 0:
+            return np.zeros((0, 2)), np.zeros(0), np.zeros(0)
+        lengths = contoursList.getLengths()
+        points = contoursList.points['contour_points_px'].astype(np.float64)
+        x, y = points[:, 0], points[:, 1]
+        #centered coordinates for a well conditioned system
+        mean_x = np.add.reduceat(x, starts) / lengths
+        mean_y = np.add.reduceat(y, starts) / lengths
+        u = x - np.repeat(mean_x, lengths)
+        v = y - np.repeat(mean_y, lengths)
+        suu = np.add.reduceat(u * u, starts)
+        svv = np.add.reduceat(v * v, starts)
+        suv = np.add.reduceat(u * v, starts)
+        b_u = np.add.reduceat(u * (u * u + v * v), starts) / 2
+        b_v = np.add.reduceat(v * (u * u + v * v), starts) / 2
+        with np.errstate(invalid='ignore', divide='ignore'):
+            det = suu * svv - suv * suv
+            center_u = (b_u * svv - b_v * suv) / det
+            center_v = (suu * b_v - suv * b_u) / det
+            radius = np.sqrt(center_u * center_u + center_v * center_v + (suu + svv) / lengths)
+            distance = np.hypot(u - np.repeat(center_u, lengths), v - np.repeat(center_v, lengths)) - np.repeat(radius, lengths)
+            residual = np.sqrt(np.add.reduceat(distance * distance, starts) / lengths)
+        #the points are pixel centers on the border, the edge is half a pixel further out of the white area.
+        #hole borders run in the opposite direction of outer borders
+        following = np.arange(1, len(points) + 1)
+        following[contoursList.offsets[1:] - 1] = starts
+        signedArea = np.add.reduceat(x * y[following] - x[following] * y, starts)
+        radius = radius + np.where(signedArea > 0, -0.5, 0.5)
+        invalid = (lengths < 3) | ~np.isfinite(radius)
+        radius[invalid] = np.nan
+        residual[invalid] = np.nan
+        center = np.stack((mean_x + center_u, mean_y + center_v), axis=1)
+        center[invalid] = np.nan
+        return center, radius, residual
 
     def _openFile(self, str_progDir, str_fileType):
         """opens a dialog to open a file
@@ -1425,6 +2344,99 @@ class DataModel(QObject):
             files = glob.glob(path)
             return files
 
+    def _readImageScaled(self, filepath):
+        """reads an image and scales it with the saved scale factor.
+        jpeg images are decoded at a reduced size (1/2, 1/4 or 1/8) that is still larger than the scaled image,
+        only the remaining scaling is done with an area resize
+
+        Args:
+            filepath (str): path of the image file
+
+        Raises:
+            NoImageException: raised when the image could not be decoded
+
+        Returns:
+            tuple: image as NumPy ndarray and dictionary with decode time in s, reduction and peak memory usage in bytes
+        """
+        start = time.perf_counter()
+        scale = self.scaleFactor
+        reduction = 1
+        for r in (8, 4, 2):
+            if scale * r <= 1.0:
+                reduction = r
+                break
+        if reduction == 1:
+            img = cv2.imread(filepath)
+        else:
+            flags = {2: cv2.IMREAD_REDUCED_COLOR_2, 4: cv2.IMREAD_REDUCED_COLOR_4, 8: cv2.IMREAD_REDUCED_COLOR_8}
+            img = cv2.imread(filepath, flags[reduction])
+        if img is None:
+            raise NoImageException()
+        if scale != 1.0:
+            #target size like cv2.resize with fx and fy on the full image
+            with Image.open(filepath) as fullImage:
+                full_w, full_h = fullImage.size
+            h, w = img.shape[:2]
+            if (w > h) != (full_w > full_h):
+                #image got rotated by exif orientation while decoding
+                full_w, full_h = full_h, full_w
+            target = (int(round(full_w * scale)), int(round(full_h * scale)))
+            if target != (w, h):
+                img = cv2.resize(img, target, interpolation=cv2.INTER_AREA)
+        stats = {
+            'file': filepath,
+            'decode_time': time.perf_counter() - start,
+            'reduction': reduction,
+            'peak_memory': self._getPeakMemoryUsage()
+        }
+        return img, stats
+
+    def _getPeakMemoryUsage(self):
+        """returns the peak memory usage (resident set size) of the program
+
+        Returns:
+            int/ None: peak memory usage in bytes or None if not available
+        """
+        try:
+            import resource
+            #linux reports kilobytes
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        except ImportError:
+            pass
+        try:
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [('cb', ctypes.c_ulong),
+                            ('PageFaultCount', ctypes.c_ulong),
+                            ('PeakWorkingSetSize', ctypes.c_size_t),
+                            ('WorkingSetSize', ctypes.c_size_t),
+                            ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+                            ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                            ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                            ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                            ('PagefileUsage', ctypes.c_size_t),
+                            ('PeakPagefileUsage', ctypes.c_size_t)]
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(PROCESS_MEMORY_COUNTERS)
+            handle = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+                return counters.PeakWorkingSetSize
+        except Exception as e:
+            pass
+        return None
+
+    def _formatMemory(self, size):
+        """formats a memory size in bytes as MB
+
+        Args:
+            size (int): size in bytes or None
+
+        Returns:
+            float/ None: size in MB, rounded to one decimal place
+        """
+        if size is None:
+            return None
+        return round(size / (1024 * 1024), 1)
+
     def _scaleImageForScreen(self, image):
         """scales an image for screen presentation if necessary
 
@@ -1470,6 +2482,34 @@ class DataModel(QObject):
             else:
                 return image
 
+    def createPreviewImage(self, image):
+        """returns the level of an image pyramid that fits into the maximal screen size, used for interactive previews.
+        the costs of a preview do not depend on the camera resolution
+
+        Args:
+            image (ndarray): image as NumPy ndarray
+
+        Returns:
+            tuple: preview image and factor between the size of the image and the preview
+        """
+        if self.maxScreenSize == None:
+            maxSize = 0.75
+        else:
+            maxSize = self.maxScreenSize
+        try:
+            #screensize primary monitor
+            user32 = ctypes.windll.user32
+            screen_w = user32.GetSystemMetrics(0)*maxSize
+            screen_h = user32.GetSystemMetrics(1)*maxSize
+        except Exception as e:
+            return image, 1
+        preview = image
+        factor = 1
+        while preview.shape[1] > screen_w or preview.shape[0] > screen_h:
+            preview = cv2.pyrDown(preview)
+            factor *= 2
+        return preview, factor
+
     def _createNewOptimalCameraMatrix(self):
         """creates a better camera matrix for undisturbing images and calculates a ROI for cropping the images
 
@@ -1479,18 +2519,481 @@ class DataModel(QObject):
         Returns:
             tuple: new camera matrix and matrix with valid pixels in the image or None if error occured
         """
-        if (self.calibrationImages or self.cameraMatrix or self.distMatrix) == None:
+        if self.calibrationImageSize is None or self.cameraMatrix is None or self.distMatrix is None:
             raise MissingInputException()
         try:
-            h, w = self.calibrationImages[0].shape[:2]
+            w, h = self.calibrationImageSize
             new_cameraMatrix, calROI = cv2.getOptimalNewCameraMatrix(self.cameraMatrix, self.distMatrix, (w,h), 1, (w,h))
             return new_cameraMatrix, calROI
         except Exception as e:
             return None, None
 
+    def _createCalibrationView(self, result):
+        """creates the entry of a calibration image with detected chessboard
+
+        Args:
+            result (dict): result of a calibration image as yielded by _iterCalibrationImages
+
+        Returns:
+            dict: index and path of the image, corners, reprojection error (rms in px) and whether the view is used or was rejected
+        """
+        return {
+            'image_index': result['image_index'],
+            'file': result['file'],
+            'corners': result['corners'],
+            'error': None,
+            'active': True,
+            'rejected': False
+        }
+
+    def _solveCalibration(self, warmStart=False):
+        """calculates camera matrix, distortion and the optimal new camera matrix from all active calibration views,
+        then calculates the reprojection errors
+
+        Args:
+            warmStart (bool): whether the current camera matrix and distortion are used as initial guess
+
+        Returns:
+            bool: True if process was succesfull, else False
+        """
+        views = [view for view in self.calibrationViews if view['active']]
+        if len(views) < self.minCalibrationViews:
+            return False
+        objPoints = [self.objp] * len(views)
+        imgPoints = [view['corners'] for view in views]
+        if warmStart and self.cameraMatrix is not None and self.distMatrix is not None:
+            flags = cv2.CALIB_USE_INTRINSIC_GUESS
+            cameraMatrix = self.cameraMatrix.copy()
+            distMatrix = self.distMatrix.copy()
+        else:
+            flags = 0
+            cameraMatrix = None
+            distMatrix = None
+        try:
+            ret, cameraMatrix, distMatrix, rotVector, tanVector = cv2.calibrateCamera(objPoints, imgPoints, self.calibrationImageSize,
+                cameraMatrix, distMatrix, flags=flags)
+        except Exception as e:
+            return False
+        self.cameraMatrix = cameraMatrix
+        self.distMatrix = distMatrix
+        self.rotVector = rotVector
+        self.tanVector = tanVector
+        self.objPoints = objPoints
+        self.imgPoints = imgPoints
+        new_cameraMatrix, calROI = self._createNewOptimalCameraMatrix()
+        if new_cameraMatrix is None or calROI is None:
+            return False
+        self.new_cameraMatrix = new_cameraMatrix
+        self.calROI = calROI
+        self._setMasterCalibration(self.calibrationScale)
+        result = self._calcMeanError()
+        if result == True:
+            for view, error in zip(views, self.reprojectionErrors['per_view']):
+                view['error'] = float(error)
+            return True
+        else:
+            return False
+
+    def _iterCalibrationImages(self, files, patternSize, criteria, keepImage=False):
+        """generator that decodes the calibration images and detects their chessboard corners in a thread pool.
+        only a limited number of images is decoded ahead, so memory usage does not depend on the number of images
+
+        Args:
+            files (list): paths of the calibration images
+            patternSize (tuple): number of inner chessboard rows and columns
+            criteria (tuple): termination criteria of the sub pixel refinement
+            keepImage (bool): whether the decoded image is returned with the result
+
+        Yields:
+            dict: result of a single image, in the order of the files
+        """
+        workers = self.detectionWorkers or 1
+        maxPending = 2 * workers
+        indexedFiles = enumerate(files)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = collections.deque()
+            for index, fname in itertools.islice(indexedFiles, maxPending):
+                pending.append(executor.submit(self._processCalibrationImage, index, fname, patternSize, criteria, keepImage))
+            while pending:
+                result = pending.popleft().result()
+                nextFile = next(indexedFiles, None)
+                if nextFile is not None:
+                    index, fname = nextFile
+                    pending.append(executor.submit(self._processCalibrationImage, index, fname, patternSize, criteria, keepImage))
+                yield result
+
+    def _processCalibrationImage(self, index, filepath, patternSize, criteria, keepImage=False):
+        """decodes a single calibration image and detects the chessboard corners,
+        a failed decode only marks this image as failed. runs inside the worker threads of the calibration
+
+        Args:
+            index (int): index of the image in the calibration files
+            filepath (str): path of the image
+            patternSize (tuple): number of inner chessboard rows and columns
+            criteria (tuple): termination criteria of the sub pixel refinement
+            keepImage (bool): whether the decoded image is returned with the result
+
+        Returns:
+            dict: index, path, detection result, corners, image size, decode and detection time, error message,
+                  optional image and thumbnail
+        """
+        result = {
+            'image_index': index,
+            'file': filepath,
+            'found': False,
+            'corners': None,
+            'image_size': None,
+            'decode_time': 0,
+            'duration': 0,
+            'error': None,
+            'image': None,
+            'thumbnail': None,
+            'cached': False
+        }
+        try:
+            with open(filepath, 'rb') as file:
+                contentHash = hashlib.sha1(file.read()).hexdigest()
+        except Exception as e:
+            result['error'] = str(e)
+            return result
+        key = self._getCornerCacheKey('calibration', contentHash, patternSize, criteria)
+        cached = self._getCachedCorners(key)
+        if cached is not None:
+            result['found'], result['corners'], result['image_size'] = cached
+            result['cached'] = True
+            if not keepImage and not self.keepCalibrationThumbnails:
+                #no image needed, skip decoding
+                return result
+        try:
+            img, stats = self._readImageScaled(filepath)
+        except Exception as e:
+            result['error'] = str(e)
+            return result
+        result['decode_time'] = stats['decode_time']
+        h, w = img.shape[:2]
+        result['image_size'] = (w, h)
+        if cached is None:
+            ret, corners2, duration = self._detectChessboardCorners(img, patternSize, criteria)
+            result['found'] = ret
+            result['corners'] = corners2
+            result['duration'] = duration
+            self._setCachedCorners(key, (ret, corners2, (w, h)))
+        if self.keepCalibrationThumbnails:
+            factor = min(1.0, self.calibrationThumbnailWidth / w)
+            result['thumbnail'] = cv2.resize(img, None, fx=factor, fy=factor, interpolation=cv2.INTER_AREA)
+        if keepImage:
+            result['image'] = img
+        return result
+
+    def _getCornerCacheKey(self, source, contentHash, patternSize, criteria):
+        """generates the key of detected chessboard corners in the corner cache.
+        the key contains every parameter the detection depends on, cached corners of other settings are not used
+
+        Args:
+            source (str): kind of image, corners of calibration and object images are detected differently
+            contentHash (str): hash of the file or image content
+            patternSize (tuple): number of inner chessboard rows and columns
+            criteria (tuple): termination criteria of the sub pixel refinement
+
+        Returns:
+            tuple: key of the corner cache
+        """
+        pyramidMaxWidth = self.pyramidMaxWidth if self.chessboardEngine == 1 else None
+        return (source, contentHash, tuple(patternSize), self.scaleFactor, self.chessboardEngine,
+            self.chessboard_engine_flags[self.chessboardEngine], pyramidMaxWidth, tuple(criteria))
+
+    def _getCachedCorners(self, key):
+        """returns detected chessboard corners from the corner cache, the cache is loaded from file on first use.
+        a found entry is moved to the end, so the least recently used entries are removed first
+
+        Args:
+            key (tuple): key of the corner cache
+
+        Returns:
+            tuple/ None: whether a chessboard was found, corners and image size or None if not cached
+        """
+        with self.cornerCacheLock:
+            if self.cornerCache is None:
+                self.cornerCache = {}
+                filepath = self.data_subdir + '/corner_cache.p'
+                if os.path.isfile(filepath):
+                    try:
+                        with open(filepath, 'rb') as file:
+                            self.cornerCache = pickle.load(file)
+                    except Exception as e:
+                        self.cornerCache = {}
+                    self._limitCornerCache()
+            value = self.cornerCache.pop(key, None)
+            if value is not None:
+                self.cornerCache[key] = value
+            return value
+
+    def _setCachedCorners(self, key, value):
+        """stores detected chessboard corners in the corner cache, the least recently used entries are removed
+        when the cache holds more than cornerCacheMaxEntries
+
+        Args:
+            key (tuple): key of the corner cache
+            value (tuple): whether a chessboard was found, corners and image size
+        """
+        with self.cornerCacheLock:
+            if self.cornerCache is None:
+                self.cornerCache = {}
+            self.cornerCache.pop(key, None)
+            self.cornerCache[key] = value
+            self.cornerCacheChanged = True
+            self._limitCornerCache()
+
+    def _limitCornerCache(self):
+        """removes the oldest entries of the corner cache until it holds at most cornerCacheMaxEntries.
+        has to be called with cornerCacheLock held
+        """
+        surplus = len(self.cornerCache) - self.cornerCacheMaxEntries
+        if surplus > 0:
+            for key in list(itertools.islice(self.cornerCache, surplus)):
+                del self.cornerCache[key]
+            self.cornerCacheChanged = True
+
+    def _saveCornerCache(self):
+        """saves the corner cache to a pickle file in the data subdirectory if it was changed
+
+        Returns:
+            bool: True when no exception, False when Exception occured
+        """
+        with self.cornerCacheLock:
+            if not self.cornerCacheChanged:
+                return True
+            try:
+                with open(self.data_subdir + '/corner_cache.p', 'wb') as file:
+                    pickle.dump(self.cornerCache, file)
+                self.cornerCacheChanged = False
+                return True
+            except Exception as e:
+                return False
+
+    def _detectChessboardCorners(self, image, patternSize, criteria):
+        """detects the inner chessboard corners of a single image and refines them to sub pixel accuracy.
+        runs inside the worker threads of the calibration
+
+        Args:
+            image (ndarray): calibration image as NumPy ndarray
+            patternSize (tuple): number of inner chessboard rows and columns
+            criteria (tuple): termination criteria of the sub pixel refinement
+
+        Returns:
+            tuple: whether a chessboard was found, refined corners or None and the duration of the detection in s
+        """
+        start = time.perf_counter()
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        ret, corners2 = self._findChessboardCorners(gray, patternSize, criteria)
+        return ret, corners2, time.perf_counter() - start
+
+    def _findChessboardCorners(self, gray, patternSize, criteria):
+        """finds the inner chessboard corners in a grayscale image with the selected detection engine
+        and records the detection statistics of the engine
+
+        Classic:        cv2.findChessboardCorners on the full image, refined with cornerSubPix
+        Pyramid:        board is searched on a downscaled pyramid level with fast check,
+                        the upscaled corners are refined with cornerSubPix in full resolution
+        Sector based:   cv2.findChessboardCornersSB, corners are already sub pixel accurate
+
+        Args:
+            gray (ndarray): grayscale image as NumPy ndarray
+            patternSize (tuple): number of inner chessboard rows and columns
+            criteria (tuple): termination criteria of the sub pixel refinement
+
+        Returns:
+            tuple: whether a chessboard was found and refined corners or None
+        """
+        start = time.perf_counter()
+        corners2 = None
+        if self.chessboardEngine == 2:
+            ret, corners = cv2.findChessboardCornersSB(gray, patternSize, self.chessboard_engine_flags[2])
+            if ret == True:
+                corners2 = corners.astype(np.float32)
+        elif self.chessboardEngine == 1:
+            small = gray
+            factor = 1
+            while small.shape[1] > self.pyramidMaxWidth:
+                small = cv2.pyrDown(small)
+                factor *= 2
+            ret, corners = cv2.findChessboardCorners(small, patternSize, None, self.chessboard_engine_flags[1])
+            if ret == True:
+                #pixel centers of a pyramid level map to (x + 0.5) * factor - 0.5 in full resolution
+                corners = (corners + 0.5) * factor - 0.5
+                #search window covers the upscaling error but stays smaller than a chessboard square
+                points = corners.reshape(patternSize[1], patternSize[0], 2)
+                spacing = min(np.min(np.linalg.norm(np.diff(points, axis=0), axis=2)), np.min(np.linalg.norm(np.diff(points, axis=1), axis=2)))
+                win = int(max(2, min(max(5, 2 * factor), 0.4 * spacing)))
+                corners2 = cv2.cornerSubPix(gray, corners.astype(np.float32), (win, win), (-1,-1), criteria)
+        else:
+            ret, corners = cv2.findChessboardCorners(gray, patternSize, None, self.chessboard_engine_flags[0])
+            if ret == True:
+                corners2 = cv2.cornerSubPix(gray, corners, (5,5), (-1,-1), criteria)
+        self._addDetectionStats(time.perf_counter() - start, ret)
+        return ret, corners2
+
+    def _addDetectionStats(self, duration, found):
+        """adds a detection to the statistics of the selected detection engine
+
+        Args:
+            duration (float): duration of the detection in s
+            found (bool): whether a chessboard was found
+        """
+        engine = self.chessboard_engine_options[self.chessboardEngine]
+        with self.cornerCacheLock:
+            stats = self.detectionStats.setdefault(engine, {'attempts': 0, 'found': 0, 'time': 0.0, 'time_failed': 0.0})
+            stats['attempts'] += 1
+            stats['time'] += duration
+            if found:
+                stats['found'] += 1
+            else:
+                stats['time_failed'] += duration
+
+    def getDetectionStats(self):
+        """returns the detection statistics of all used detection engines
+
+        Returns:
+            dict: per engine the number of attempts, the detection rate, the mean detection time and the mean time of failed detections in s
+        """
+        result = {}
+        with self.cornerCacheLock:
+            for engine, stats in self.detectionStats.items():
+                failed = stats['attempts'] - stats['found']
+                result[engine] = {
+                    'attempts': stats['attempts'],
+                    'detection_rate': stats['found'] / stats['attempts'],
+                    'mean_time': stats['time'] / stats['attempts'],
+                    'mean_time_failed': stats['time_failed'] / failed if failed > 0 else None
+                }
+        return result
+
+    def _undistortPoints(self, points):
+        """maps points of the distorted image into the undistorted image cropped by the calibration ROI
+
+        Args:
+            points (ndarray): points as float32 NumPy ndarray with shape (n, 1, 2)
+
+        Returns:
+            ndarray: undistorted points as float32 NumPy ndarray with shape (n, 1, 2)
+        """
+        #iterative version, the default of undistortPoints stops after 5 iterations and is off by a fraction of a pixel with wide angle lenses
+        criteria = (cv2.TERM_CRITERIA_COUNT + cv2.TERM_CRITERIA_EPS, 20, 1e-6)
+        undistorted = cv2.undistortPointsIter(points, self.cameraMatrix, self.distMatrix, None, self.new_cameraMatrix, criteria)
+        if self.calROI is not None:
+            x, y = self.calROI[0], self.calROI[1]
+            undistorted -= np.array((x, y), dtype=np.float32)
+        return undistorted
+
+    def _undistortContours(self, contours):
+        """undistorts the points of all contours with one call
+
+        Args:
+            contours (list): contours as returned by cv2.findContours
+
+        Returns:
+            list: contours with undistorted points as int32 NumPy ndarrays
+        """
+        if len(contours) == 0:
+            return contours
+        lengths = [len(c) for c in contours]
+        points = np.concatenate(contours).astype(np.float32)
+        undistorted = np.round(self._undistortPoints(points)).astype(np.int32)
+        return np.split(undistorted, np.cumsum(lengths)[:-1])
+
+    def _getUndistortROI(self):
+        """returns the calibration ROI if only the ROI should be undistorted
+
+        Returns:
+            tuple/ None: x, y, width and height of the ROI or None if the full image is undistorted
+        """
+        if self.undistortMode != 1 or self.calROI is None:
+            return None
+        x, y, w, h = [int(i) for i in self.calROI]
+        if w <= 0 or h <= 0:
+            return None
+        return x, y, w, h
+
+    def _getUndistortMaps(self, imageSize):
+        """returns the remap tables for undistorting images of the given size.
+        tables are only calculated once per camera matrix, distortion, image size and ROI.
+        in ROI mode the tables only cover the calibration ROI, so remapping writes straight into the cropped image
+
+        Args:
+            imageSize (tuple): width and height of the image
+
+        Returns:
+            tuple: both remap tables in fixed point format (CV_16SC2)
+        """
+        roi = self._getUndistortROI()
+        key = self._getUndistortMapsKey(imageSize, roi)
+        if self.undistortMaps is None or self.undistortMapsKey != key:
+            if roi is None:
+                map1, map2 = cv2.initUndistortRectifyMap(self.cameraMatrix, self.distMatrix, None, self.new_cameraMatrix, imageSize, cv2.CV_16SC2)
+            else:
+                #shifting the principal point moves the origin of the output image to the top left corner of the ROI
+                x, y, w, h = roi
+                roi_cameraMatrix = self.new_cameraMatrix.copy()
+                roi_cameraMatrix[0, 2] -= x
+                roi_cameraMatrix[1, 2] -= y
+                map1, map2 = cv2.initUndistortRectifyMap(self.cameraMatrix, self.distMatrix, None, roi_cameraMatrix, (w, h), cv2.CV_16SC2)
+            self.undistortMaps = (map1, map2)
+            self.undistortMapsKey = key
+        return self.undistortMaps
+
+    def _getUndistortMapsKey(self, imageSize, roi):
+        """generates the key the remap tables are stored with
+
+        Args:
+            imageSize (tuple): width and height of the image
+            roi (tuple/ None): ROI covered by the remap tables, None for the full image
+
+        Returns:
+            tuple: key of the remap tables
+        """
+        return (self.cameraMatrix.tobytes(), self.distMatrix.tobytes(), self.new_cameraMatrix.tobytes(), tuple(imageSize), roi)
+
+    def _getUndistortMapsFilepath(self, calFilepath):
+        """returns the path of the remap tables file belonging to a calibration pickle
+
+        Args:
+            calFilepath (str): path of the calibration pickle
+
+        Returns:
+            str: path of the remap tables file
+        """
+        return os.path.splitext(calFilepath)[0] + '_maps.npz'
+
+    def _loadUndistortMaps(self, calFilepath):
+        """loads the remap tables stored next to a calibration pickle.
+        if no file is found the tables are calculated with the first undistorted image
+
+        Args:
+            calFilepath (str): path of the calibration pickle
+
+        Returns:
+            bool: True if remap tables were loaded, else False
+        """
+        self.undistortMaps = None
+        self.undistortMapsKey = None
+        filepath = self._getUndistortMapsFilepath(calFilepath)
+        if not os.path.isfile(filepath):
+            return False
+        try:
+            with np.load(filepath) as maps:
+                roi = None
+                if 'roi' in maps.files and maps['roi'].size == 4:
+                    roi = tuple(int(i) for i in maps['roi'])
+                self.undistortMaps = (maps['map1'], maps['map2'])
+                self.undistortMapsKey = self._getUndistortMapsKey(tuple(int(i) for i in maps['size']), roi)
+            return True
+        except Exception as e:
+            return False
+
     def _calcMeanError(self):
-        """calculates the mean re-projection error of all found chessboard corners. distance between projected and calculated position of chessboard corner.
-        is an indicator for quality of camera calibration
+        """calculates the re-projection errors of all found chessboard corners. distance between projected and calculated position of chessboard corner.
+        is an indicator for quality of camera calibration.
+        all views are projected at once, the per view and per corner errors and an error heatmap over the sensor are stored in reprojectionErrors
 
         Raises:
             MissingInputException: raised when at least one of the necessary input is missing
@@ -1498,20 +3001,110 @@ class DataModel(QObject):
         Returns:
             bool: True when finished, False when error occured
         """
-        if (self.objPoints or self.imgPoints or self.rotVector or self.tanVector or self.cameraMatrix or self.distMatrix) == None:
+        if self.objPoints is None or self.imgPoints is None or self.rotVector is None or self.tanVector is None or self.cameraMatrix is None or self.distMatrix is None:
             raise MissingInputException()
         try:
-            meanError = 0
-            for i in range(len(self.objPoints)):
-                imagePoints, _ = cv2.projectPoints(self.objPoints[i], self.rotVector[i], self.tanVector[i], self.cameraMatrix, self.distMatrix)
-                error = cv2.norm(self.imgPoints[i], imagePoints, cv2.NORM_L2)/len(imagePoints)
-                meanError += error
-            meanError = meanError/len(self.objPoints)
-            self.meanError = meanError
+            objPoints = np.array(self.objPoints, dtype=np.float64).reshape(len(self.objPoints), -1, 3)
+            imgPoints = np.array(self.imgPoints, dtype=np.float64).reshape(len(self.imgPoints), -1, 2)
+            projected = self._projectViews(objPoints)
+            residuals = imgPoints - projected
+            cornerErrors = np.sqrt(np.sum(residuals * residuals, axis=2))
+            numCorners = cornerErrors.shape[1]
+            self.reprojectionErrors = {
+                'per_view': np.sqrt(np.mean(cornerErrors * cornerErrors, axis=1)),
+                'per_corner': cornerErrors,
+                'residuals': residuals,
+                'rms': float(np.sqrt(np.mean(cornerErrors * cornerErrors))),
+                'max': float(np.max(cornerErrors)),
+                'heatmap': self._calcErrorHeatmap(imgPoints.reshape(-1, 2), cornerErrors.ravel())
+            }
+            #mean over all views of the L2 norm of a view divided by its number of corners
+            self.meanError = float(np.mean(np.sqrt(np.sum(cornerErrors * cornerErrors, axis=1)) / numCorners))
             return True
         except Exception as e:
             return False
 
+    def _projectViews(self, objPoints):
+        """projects the object points of all calibration views into the image at once,
+        uses the same camera model as cv2.projectPoints (radial, tangential and rational distortion)
+
+        Args:
+            objPoints (ndarray): object points of all views as NumPy ndarray with shape (views, corners, 3)
+
+        Returns:
+            ndarray: projected image points with shape (views, corners, 2)
+        """
+        dist = np.zeros(8)
+        coefficients = np.asarray(self.distMatrix, dtype=np.float64).ravel()
+        if len(coefficients) > 8:
+            #thin prism and tilted models are not used by the calibration, project view by view
+            projected = []
+            for i in range(len(objPoints)):
+                imagePoints, _ = cv2.projectPoints(objPoints[i], self.rotVector[i], self.tanVector[i], self.cameraMatrix, self.distMatrix)
+                projected.append(imagePoints.reshape(-1, 2))
+            return np.array(projected)
+        dist[:len(coefficients)] = coefficients
+        k1, k2, p1, p2, k3, k4, k5, k6 = dist
+        rotations = self._rodrigues(np.array(self.rotVector, dtype=np.float64).reshape(-1, 3))
+        translations = np.array(self.tanVector, dtype=np.float64).reshape(-1, 1, 3)
+        cameraPoints = np.einsum('vij,vkj->vki', rotations, objPoints) + translations
+        x = cameraPoints[..., 0] / cameraPoints[..., 2]
+        y = cameraPoints[..., 1] / cameraPoints[..., 2]
+        r2 = x * x + y * y
+        radial = (1 + r2 * (k1 + r2 * (k2 + r2 * k3))) / (1 + r2 * (k4 + r2 * (k5 + r2 * k6)))
+        xd = x * radial + 2 * p1 * x * y + p2 * (r2 + 2 * x * x)
+        yd = y * radial + p1 * (r2 + 2 * y * y) + 2 * p2 * x * y
+        K = self.cameraMatrix
+        u = K[0, 0] * xd + K[0, 1] * yd + K[0, 2]
+        v = K[1, 1] * yd + K[1, 2]
+        return np.stack((u, v), axis=2)
+
+    def _rodrigues(self, rotVectors):
+        """converts rotation vectors into rotation matrices
+
+        Args:
+            rotVectors (ndarray): rotation vectors as NumPy ndarray with shape (n, 3)
+
+        Returns:
+            ndarray: rotation matrices with shape (n, 3, 3)
+        """
+        theta = np.linalg.norm(rotVectors, axis=1)
+        safeTheta = np.where(theta < 1e-12, 1.0, theta)
+        k = rotVectors / safeTheta[:, None]
+        cos = np.cos(theta)[:, None, None]
+        sin = np.sin(theta)[:, None, None]
+        cross = np.zeros((len(rotVectors), 3, 3))
+        cross[:, 0, 1] = -k[:, 2]
+        cross[:, 0, 2] = k[:, 1]
+        cross[:, 1, 0] = k[:, 2]
+        cross[:, 1, 2] = -k[:, 0]
+        cross[:, 2, 0] = -k[:, 1]
+        cross[:, 2, 1] = k[:, 0]
+        outer = np.einsum('ni,nj->nij', k, k)
+        return cos * np.eye(3) + (1 - cos) * outer + sin * cross
+
+    def _calcErrorHeatmap(self, points, errors):
+        """calculates the mean reprojection error of the corners in each cell of a grid over the sensor
+
+        Args:
+            points (ndarray): image points as NumPy ndarray with shape (n, 2)
+            errors (ndarray): reprojection error of each point with shape (n)
+
+        Returns:
+            ndarray: mean error per cell with shape (rows, columns), NaN in cells without corners
+        """
+        columns, rows = self.errorHeatmapGrid
+        w, h = self.calibrationImageSize
+        col = np.clip((points[:, 0] * columns / w).astype(int), 0, columns - 1)
+        row = np.clip((points[:, 1] * rows / h).astype(int), 0, rows - 1)
+        cell = row * columns + col
+        count = np.bincount(cell, minlength=rows * columns)
+        total = np.bincount(cell, weights=errors, minlength=rows * columns)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            heatmap = total / count
+        heatmap[count == 0] = np.nan
+        return heatmap.reshape(rows, columns)
+
     def _pointTransformCoordinateSystem(self, point=None):
         """recalculates a point, given as x,y-tuple, corresponding to a reference point
 
@@ -1540,31 +3133,24 @@ class DataModel(QObject):
             else:
                 raise InappropriateParameterException()
 
-    def _flipYAxis(self):
-        """flips the values of the y-axis coordinates, only in mm, in the contours list.
-        this is necessary because in this program y-axis is from top to bottom and in cad programs it runs from bottom to top
+    def _convertContoursListToMM(self):
+        """calculates the values in mm for each x-,y-coordinate in the contours list, relative to the reference point
 
         Raises:
-            MissingInputException: raised when contours state was not set to true
+            MissingInputException: raised if the states of contours or a new reference are not set to true or if the mm/px ratio was not calculated
 
         Returns:
-            bool: True when finished flipping x-axis coordinates
+            bool: True when finished
         """
-        if not self.contoursState:
+        if not self.contoursState or not self.newReferenceState or self.mmPerPxRatio == None:
             raise MissingInputException()
-        for cont in self.contoursList:
-            for i in range(len(cont['contour_points_mm'])):
-                x, y = cont['contour_points_mm'][i]
-                y *= -1
-                cont['contour_points_mm'][i] = (x, y)
-            if cont['contour_is_hole']:
-                x, y = cont['center_point_ref_mm']
-                y *= -1
-                cont['center_point_ref_mm'] = (x, y)
+        self._updateCoordinateTransforms()
+        self._applyTransformToContoursList(self.pxToMmTransform, 'contour_points_mm', 'center_point_ref_mm')
         return True
 
-    def _convertContoursListToMM(self):
-        """calculates the values in mm for each x-,y-coordinate in the contours list
+    def _convertContoursListToCAD(self):
+        """calculates the cad coordinates for each x-,y-coordinate in the contours list.
+        same as mm relative to the reference point, but with the y-axis running from bottom to top
 
         Raises:
             MissingInputException: raised if the states of contours or a new reference are not set to true or if the mm/px ratio was not calculated
@@ -1574,18 +3160,73 @@ class DataModel(QObject):
         """
         if not self.contoursState or not self.newReferenceState or self.mmPerPxRatio == None:
             raise MissingInputException()
-        for cont in self.contoursList:
-            new_c = []
-            for i in range(len(cont['contour_points_px'])):
-                (x_px, y_px) = cont['contour_points_px'][i][0]
-                new_x_mm = self._convertToMM(measure=x_px)
-                new_y_mm = self._convertToMM(measure=y_px)
-                new_c.append(tuple((new_x_mm, new_y_mm)))
-            cont['contour_points_mm'] = new_c
-            if cont['contour_is_hole']:
-                (center_x_px, center_y_px) = cont['center_point_ref']
-                center_x_mm = self._convertToMM(measure=center_x_px)
-                center_y_mm = self._convertToMM(measure=center_y_px)
-                new_center_mm = (center_x_mm, center_y_mm)
-                cont.update({'center_point_ref_mm': new_center_mm})
-        return True
\ No newline at end of file
+        self._updateCoordinateTransforms()
+        self._applyTransformToContoursList(self.pxToCadTransform, 'contour_points_cad', 'center_point_cad')
+        return True
+
+    def _updateCoordinateTransforms(self):
+        """combines translation to the reference point, pixel to mm mapping and y-axis flip into one 3x3 transform each,
+        pxToMmTransform for reports and pxToCadTransform for the dxf export. both are applied to pixel coordinates of the image.
+        without homography the pixels are scaled with the mm per pixel ratio.
+        the transforms are only calculated again when reference point, homography or mm per pixel ratio changed
+        """
+        key = self._getCoordinateTransformsKey()
+        if key == self.coordinateTransformsKey:
+            return
+        if self.pxToMmHomography is not None:
+            pxToMm = self.pxToMmHomography
+        else:
+            pxToMm = np.diag((self.mmPerPxRatio, self.mmPerPxRatio, 1.0))
+        origin = pxToMm @ np.array((self.referencePoint[0], self.referencePoint[1], 1.0))
+        translation = np.array(((1, 0, -origin[0] / origin[2]), (0, 1, -origin[1] / origin[2]), (0, 0, 1)))
+        self.pxToMmTransform = translation @ pxToMm
+        self.pxToCadTransform = np.diag((1.0, -1.0, 1.0)) @ self.pxToMmTransform
+        self.coordinateTransformsKey = key
+
+    def _getCoordinateTransformsKey(self):
+        """generates the key of the inputs the coordinate transforms are calculated from
+
+        Returns:
+            tuple: reference point and homography or mm per pixel ratio
+        """
+        if self.pxToMmHomography is not None:
+            return (tuple(self.referencePoint), self.pxToMmHomography.tobytes())
+        return (tuple(self.referencePoint), self.mmPerPxRatio)
+
+    def _applyTransformToContoursList(self, transform, pointsKey, centerKey):
+        """applies a 3x3 transform to the points and centers of all contours with one matrix multiplication.
+        the results are stored in separate read only arrays and only calculated again when the transform changed
+
+        Args:
+            transform (ndarray): 3x3 transform applied to pixel coordinates
+            pointsKey (str): key the transformed contour points are stored with
+            centerKey (str): key the transformed contour centers are stored with
+        """
+        if self.derivedCoordinatesKeys.get(pointsKey) == self.coordinateTransformsKey:
+            return
+        table = self.contoursList
+        #holes use the sub-pixel center of the fitted circle
+        centers = table.columns['contour_center_px'].astype(np.float64)
+        fitted = np.isfinite(table.columns['circle_radius_px'])
+        centers[fitted] = table.columns['circle_center_px'][fitted]
+        points = np.concatenate((table.points['contour_points_px'], centers))
+        transformed = self._transformPoints(points, transform)
+        numPoints = len(table.points['contour_points_px'])
+        table.setPoints(pointsKey, transformed[:numPoints])
+        table.points[pointsKey].setflags(write=False)
+        table.setColumn(centerKey, transformed[numPoints:])
+        self.derivedCoordinatesKeys[pointsKey] = self.coordinateTransformsKey
+
+    def _transformPoints(self, points, transform):
+        """applies a 3x3 transform in homogeneous coordinates to points
+
+        Args:
+            points (ndarray): points as NumPy ndarray with shape (n, 2)
+            transform (ndarray): 3x3 transform
+
+        Returns:
+            ndarray: transformed points as float64 NumPy ndarray with shape (n, 2)
+        """
+        points = points.astype(np.float64)
+        transformed = points @ transform[:, :2].T + transform[:, 2]
+        return transformed[:, :2] / transformed[:, 2:]
\ No newline at end of file
@@ -0,0 +1,119 @@
+#Copyright (C) 2021 Marc Sebastian Heinz
+#                   <sebastian.heinz[at]]online.de>
+#Copyright (C) 2021 AVL Schrick GmbH
+#                   Dreherstraße 3-5
+#                   42899 Remscheid
+#                   <info@avl-schrick.com>
+
+#This program is free software: you can redistribute it and/or modify
+#it under the terms of the GNU General Public License as published by
+#the Free Software Foundation, either version 3 of the License, or
+#(at your option) any later version.
+
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU General Public License for more details.
+
+#You should have received a copy of the GNU General Public License
+#along with this program.  If not, see <https://www.gnu.org/licenses/>
+
+import cv2, numpy as np
+
+class ThresholdEngine():
+    """calculates HSV threshold masks for any number of ranges with lookup tables.
+    the H, S and V planes are split once. every range is one bit in a 256 entry lookup table per plane,
+    so up to 8 ranges are evaluated together with three cv2.LUT calls and two bitwise ANDs.
+    a range either includes or excludes its colors. the bit masks of a plane are only calculated again
+    when a bound of that plane changed
+    """
+
+    ranges_per_group = 8
+
+    def __init__(self, hsvImage):
+        """splits the image into its planes
+
+        Args:
+            hsvImage (ndarray): HSV image as uint8 NumPy ndarray
+        """
+        self.planes = cv2.split(hsvImage)
+        #(group, plane): (bounds of the ranges in the group, bit mask of the plane)
+        self.planeBits = {}
+        self.maskKey = None
+        self.mask = None
+
+    def getMask(self, ranges):
+        """returns the mask of all pixels within at least one including range and outside of all excluding ranges,
+        the bounds are included like with cv2.inRange. without including ranges all pixels that are not excluded are in the mask
+
+        Args:
+            ranges (list): tuples (lower, upper, include) with lower and upper bounds of H, S and V
+                and whether the colors of the range are included or excluded
+
+        Returns:
+            ndarray: mask as uint8 NumPy ndarray, 255 for selected pixels
+        """
+        ranges = [(tuple(int(v) for v in lower), tuple(int(v) for v in upper), bool(include)) for lower, upper, include in ranges]
+        key = tuple(ranges)
+        if key == self.maskKey:
+            return self.mask
+        shape = self.planes[0].shape
+        included = None
+        excluded = None
+        for group, start in enumerate(range(0, len(ranges), self.ranges_per_group)):
+            groupRanges = ranges[start:start + self.ranges_per_group]
+            bits = None
+            for plane in range(3):
+                bounds = tuple((lower[plane], upper[plane]) for lower, upper, _ in groupRanges)
+                planeBits = self._getPlaneBits(group, plane, bounds)
+                bits = planeBits if bits is None else cv2.bitwise_and(bits, planeBits)
+            includeBits = sum(1 << index for index, (_, _, include) in enumerate(groupRanges) if include)
+            excludeBits = sum(1 << index for index, (_, _, include) in enumerate(groupRanges) if not include)
+            if includeBits:
+                hits = cv2.LUT(bits, self._createDecisionLUT(includeBits))
+                included = hits if included is None else cv2.bitwise_or(included, hits)
+            if excludeBits:
+                hits = cv2.LUT(bits, self._createDecisionLUT(excludeBits))
+                excluded = hits if excluded is None else cv2.bitwise_or(excluded, hits)
+        if included is None:
+            included = np.full(shape, 255 if ranges else 0, dtype=np.uint8)
+        if excluded is None:
+            mask = included
+        else:
+            mask = cv2.bitwise_and(included, cv2.bitwise_not(excluded))
+        self.maskKey = key
+        self.mask = mask
+        return mask
+
+    def _getPlaneBits(self, group, plane, bounds):
+        """returns the bit mask of a plane for a group of ranges, bit i is set if the value is within the bounds of range i
+
+        Args:
+            group (int): index of the group of ranges
+            plane (int): index of the plane (0 = H, 1 = S, 2 = V)
+            bounds (tuple): lower and upper bound of the plane for every range of the group
+
+        Returns:
+            ndarray: bit mask as uint8 NumPy ndarray
+        """
+        cached = self.planeBits.get((group, plane))
+        if cached is not None and cached[0] == bounds:
+            return cached[1]
+        values = np.arange(256)
+        lut = np.zeros(256, dtype=np.uint8)
+        for bit, (lower, upper) in enumerate(bounds):
+            lut[(values >= lower) & (values <= upper)] |= np.uint8(1 << bit)
+        planeBits = cv2.LUT(self.planes[plane], lut)
+        self.planeBits[(group, plane)] = (bounds, planeBits)
+        return planeBits
+
+    def _createDecisionLUT(self, bitMask):
+        """creates the lookup table that selects pixels with at least one of the given bits set
+
+        Args:
+            bitMask (int): bits of the ranges
+
+        Returns:
+            ndarray: lookup table as uint8 NumPy ndarray with 256 entries
+        """
+        return np.where(np.arange(256) & bitMask, 255, 0).astype(np.uint8)
@@ -36,6 +36,8 @@ class BinarizeView(QWidget, QObject, WidgetInterface):
     sliderChanged_Signal = pyqtSignal()
     toggleRefImage_Signal = pyqtSignal()
     toggleChannelMode_Signal = pyqtSignal()
+    addRange_Signal = pyqtSignal()
+    clearRanges_Signal = pyqtSignal()
 
     def __init__(self):
         """initiates the view
@@ -57,6 +59,8 @@ class BinarizeView(QWidget, QObject, WidgetInterface):
         self.channel_checkbox.toggled.connect(self.toggleChannelMode)
 
         self.colorChannel_label1 = QLabel('Color Threshold Channel 1')
+        self.exclude_checkbox1 = QCheckBox('Exclude colors')
+        self.exclude_checkbox1.toggled.connect(self.sliderChanged)
 
         self.hue_min_label1 = QLabel('min. Hue')
         self.hue_min_slider1 = QSlider(Qt.Horizontal)
@@ -112,6 +116,8 @@ class BinarizeView(QWidget, QObject, WidgetInterface):
         self.distance_dummy = QLabel('')
 
         self.colorChannel_label2 = QLabel('Color Threshold Channel 2')
+        self.exclude_checkbox2 = QCheckBox('Exclude colors')
+        self.exclude_checkbox2.toggled.connect(self.sliderChanged)
 
         self.hue_min_label2 = QLabel('min. Hue')
         self.hue_min_slider2 = QSlider(Qt.Horizontal)
@@ -164,6 +170,12 @@ class BinarizeView(QWidget, QObject, WidgetInterface):
         self.hsv_min_label2 = QLabel()
         self.hsv_max_label2 = QLabel()
 
+        self.ranges_label = QLabel('Additional ranges: none')
+        self.add_range_button = QPushButton('Keep channel 1 as additional range')
+        self.add_range_button.clicked.connect(self.addRange)
+        self.clear_ranges_button = QPushButton('Clear additional ranges')
+        self.clear_ranges_button.clicked.connect(self.clearRanges)
+
         self.close_button = QPushButton('Apply and close')
         self.close_button.clicked.connect(self.reqClose)
 
@@ -173,7 +185,8 @@ class BinarizeView(QWidget, QObject, WidgetInterface):
         self.grid_layout.addWidget(self.channel_label, 2, 1)
         self.grid_layout.addWidget(self.channel_checkbox, 2, 2)
 
-        self.grid_layout.addWidget(self.colorChannel_label1, 3, 1, 1, 2)
+        self.grid_layout.addWidget(self.colorChannel_label1, 3, 1)
+        self.grid_layout.addWidget(self.exclude_checkbox1, 3, 2)
 
         self.grid_layout.addWidget(self.hue_min_label1, 4, 1)
         self.grid_layout.addWidget(self.hue_min_slider1, 5, 1, 1, 2)
@@ -195,7 +208,8 @@ class BinarizeView(QWidget, QObject, WidgetInterface):
 
         self.grid_layout.addWidget(self.distance_dummy, 18, 1)
 
-        self.grid_layout.addWidget(self.colorChannel_label2, 19, 1, 1, 2)
+        self.grid_layout.addWidget(self.colorChannel_label2, 19, 1)
+        self.grid_layout.addWidget(self.exclude_checkbox2, 19, 2)
 
         self.grid_layout.addWidget(self.hue_min_label2, 20, 1)
         self.grid_layout.addWidget(self.hue_min_slider2, 21, 1, 1, 2)
@@ -215,7 +229,11 @@ class BinarizeView(QWidget, QObject, WidgetInterface):
         self.grid_layout.addWidget(self.hsv_min_label2, 32, 1, 1, 2)
         self.grid_layout.addWidget(self.hsv_max_label2, 33, 1, 1, 2)
 
-        self.grid_layout.addWidget(self.close_button, 34, 1)
+        self.grid_layout.addWidget(self.ranges_label, 34, 1, 1, 2)
+        self.grid_layout.addWidget(self.add_range_button, 35, 1)
+        self.grid_layout.addWidget(self.clear_ranges_button, 35, 2)
+
+        self.grid_layout.addWidget(self.close_button, 36, 1)
 
     def sliderChanged(self):
         """emits a slider changed signal
@@ -232,6 +250,16 @@ class BinarizeView(QWidget, QObject, WidgetInterface):
         """
         self.toggleChannelMode_Signal.emit()
 
+    def addRange(self):
+        """emits a signal for keeping the range of channel 1 as additional range
+        """
+        self.addRange_Signal.emit()
+
+    def clearRanges(self):
+        """emits a signal for removing all additional ranges
+        """
+        self.clearRanges_Signal.emit()
+
     def reqClose(self):
         """emits a signal that requests closing of the view
         """
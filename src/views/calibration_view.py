@@ -39,6 +39,8 @@ class CalibrationView(QWidget, QObject, WidgetInterface):
     chessboardSize_Signal = pyqtSignal(float)
     calculateCalData_Signal = pyqtSignal()
     saveCalData_Signal = pyqtSignal()
+    addCalImages_Signal = pyqtSignal()
+    showErrorMap_Signal = pyqtSignal()
     undoChanges_Signal = pyqtSignal()
     
     def __init__(self):
@@ -111,17 +113,36 @@ class CalibrationView(QWidget, QObject, WidgetInterface):
         self.calibration_start_button.clicked.connect(self.calculateCalibrationData)
         self.calibration_start_button.setEnabled(False)
 
+        self.add_images_header = QLabel('Add calibration images and re-calibrate (optional)')
+        self.add_images_button = QPushButton('Add')
+        self.add_images_status = QLabel()
+        self.grid_layout.addWidget(self.add_images_header, 7, 1)
+        self.grid_layout.addWidget(self.add_images_button, 7, 2)
+        self.grid_layout.addWidget(self.add_images_status, 7, 3)
+        self.add_images_button.clicked.connect(self.addCalibrationImages)
+        self.add_images_button.setEnabled(False)
+
         self.save_file_header = QLabel('Save calibration data for later use (optional)')
         self.save_button = QPushButton('Save')
         self.save_status = QLabel()
-        self.grid_layout.addWidget(self.save_file_header, 7, 1)
-        self.grid_layout.addWidget(self.save_button, 7, 2)
-        self.grid_layout.addWidget(self.save_status, 7, 3)
+        self.grid_layout.addWidget(self.save_file_header, 8, 1)
+        self.grid_layout.addWidget(self.save_button, 8, 2)
+        self.grid_layout.addWidget(self.save_status, 8, 3)
         self.save_button.clicked.connect(self.saveCalibrationFile)
         self.save_button.setEnabled(False)
 
+        self.detection_info_label = QLabel()
+        self.grid_layout.addWidget(self.detection_info_label, 9, 1, 1, 3)
+
+        self.error_map_header = QLabel('Show reprojection error over the sensor')
+        self.error_map_button = QPushButton('Show')
+        self.grid_layout.addWidget(self.error_map_header, 10, 1)
+        self.grid_layout.addWidget(self.error_map_button, 10, 2)
+        self.error_map_button.clicked.connect(self.showErrorMap)
+        self.error_map_button.setEnabled(False)
+
         self.close_button = QPushButton('Apply and Close')
-        self.grid_layout.addWidget(self.close_button, 8, 1)
+        self.grid_layout.addWidget(self.close_button, 11, 1)
         self.close_button.clicked.connect(self.close)
 
     def showGeneralInformationView(self):
@@ -162,6 +183,16 @@ class CalibrationView(QWidget, QObject, WidgetInterface):
         """
         self.calculateCalData_Signal.emit()
 
+    def addCalibrationImages(self):
+        """emits a signal for adding calibration images to the calibration
+        """
+        self.addCalImages_Signal.emit()
+
+    def showErrorMap(self):
+        """emits a signal for showing the reprojection error heatmap
+        """
+        self.showErrorMap_Signal.emit()
+
     def saveCalibrationFile(self):
         """emits a signal for saving the calibration data in a file
         """
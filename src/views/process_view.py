@@ -33,6 +33,7 @@ class ProcessView(QWidget, QObject, WidgetInterface):
     """
     openBinaryView_Signal = pyqtSignal()
     findContours_Signal = pyqtSignal()
+    checkAccuracy_Signal = pyqtSignal()
     findCenter_Signal = pyqtSignal()
     setReference_Signal = pyqtSignal()
     closeView_Signal = pyqtSignal()
@@ -65,15 +66,22 @@ class ProcessView(QWidget, QObject, WidgetInterface):
         self.grid_layout.addWidget(self.contoursState_label, 2, 4)
         self.contours_button.clicked.connect(self.findContours)
         self.contours_button.setEnabled(False)
+        self.accuracy_button = QPushButton('Check accuracy')
+        self.accuracy_button.setToolTip('Compares the sparse undistortion with the undistortion of the whole image')
+        self.grid_layout.addWidget(self.accuracy_button, 2, 3)
+        self.accuracy_button.clicked.connect(self.checkAccuracy)
+        self.accuracy_button.setEnabled(False)
+        self.accuracy_label = QLabel()
+        self.grid_layout.addWidget(self.accuracy_label, 3, 1, 1, 4)
 
         self.center_header = QLabel('Find the center of the object\nor select a coordinate origin')
         self.center_button = QPushButton('Find Center')
         self.setOrigin_button = QPushButton('Set Origin')
         self.referenceState_label = QLabel()
-        self.grid_layout.addWidget(self.center_header, 3, 1)
-        self.grid_layout.addWidget(self.center_button, 3, 2)
-        self.grid_layout.addWidget(self.setOrigin_button, 3, 3)
-        self.grid_layout.addWidget(self.referenceState_label, 3, 4)
+        self.grid_layout.addWidget(self.center_header, 4, 1)
+        self.grid_layout.addWidget(self.center_button, 4, 2)
+        self.grid_layout.addWidget(self.setOrigin_button, 4, 3)
+        self.grid_layout.addWidget(self.referenceState_label, 4, 4)
         self.center_button.clicked.connect(self.findCenter)
         self.setOrigin_button.clicked.connect(self.setReference)
         self.center_button.setEnabled(False)
@@ -93,6 +101,11 @@ class ProcessView(QWidget, QObject, WidgetInterface):
         """
         self.findContours_Signal.emit()
 
+    def checkAccuracy(self):
+        """checks the accuracy of the sparse undistortion
+        """
+        self.checkAccuracy_Signal.emit()
+
     def findCenter(self):
         """tries to find a center in the image
         """
@@ -39,6 +39,10 @@ class SettingView(QWidget, QObject, WidgetInterface):
     showDuration_Signal = pyqtSignal()
     toggleStartupView_Signal = pyqtSignal()
     morphSelect_Signal = pyqtSignal(str)
+    undistortSelect_Signal = pyqtSignal(int)
+    engineSelect_Signal = pyqtSignal(int)
+    togglePrefilter_Signal = pyqtSignal()
+    maxRingWidth_Signal = pyqtSignal()
 
     def __init__(self):
         """initiates the view
@@ -102,8 +106,33 @@ class SettingView(QWidget, QObject, WidgetInterface):
         self.grid_layout.addWidget(self.morph_combobox, 8, 2)
         self.morph_combobox.activated[str].connect(self.morphSelect)
 
+        self.undistort_label = QLabel('Method used for undistorting images')
+        self.undistort_combobox = QComboBox()
+        self.grid_layout.addWidget(self.undistort_label, 9, 1)
+        self.grid_layout.addWidget(self.undistort_combobox, 9, 2)
+        self.undistort_combobox.activated[int].connect(self.undistortSelect)
+
+        self.engine_label = QLabel('Method used for detecting chessboards')
+        self.engine_combobox = QComboBox()
+        self.grid_layout.addWidget(self.engine_label, 10, 1)
+        self.grid_layout.addWidget(self.engine_combobox, 10, 2)
+        self.engine_combobox.activated[int].connect(self.engineSelect)
+
+        self.prefilter_label = QLabel('Remove interference before finding contours?')
+        self.prefilter_checkbox = QCheckBox()
+        self.grid_layout.addWidget(self.prefilter_label, 11, 1)
+        self.grid_layout.addWidget(self.prefilter_checkbox, 11, 2)
+        self.prefilter_checkbox.toggled.connect(self.togglePrefilter)
+
+        self.ring_label = QLabel('Maximum width of a ring whose inner edge is a duplicate of its outer edge (in mm)')
+        self.ring_input = QLineEdit()
+        self.ring_input.setMaxLength(5)
+        self.grid_layout.addWidget(self.ring_label, 12, 1)
+        self.grid_layout.addWidget(self.ring_input, 12, 2)
+        self.ring_input.editingFinished.connect(self.ringWidthInput)
+
         self.close_button = QPushButton('Apply and close')
-        self.grid_layout.addWidget(self.close_button, 9, 1)
+        self.grid_layout.addWidget(self.close_button, 13, 1)
         self.close_button.clicked.connect(self.reqClose)
 
     def chooseDir(self):
@@ -144,6 +173,32 @@ class SettingView(QWidget, QObject, WidgetInterface):
         """
         self.morphSelect_Signal.emit(listItem)
 
+    def undistortSelect(self, index):
+        """emits a signal for undistortion method selection with index as parameter
+
+        Args:
+            index (int): index of the selected list item
+        """
+        self.undistortSelect_Signal.emit(index)
+
+    def engineSelect(self, index):
+        """emits a signal for chessboard detection method selection with index as parameter
+
+        Args:
+            index (int): index of the selected list item
+        """
+        self.engineSelect_Signal.emit(index)
+
+    def ringWidthInput(self):
+        """emits a signal when a new maximum ring width was entered
+        """
+        self.maxRingWidth_Signal.emit()
+
+    def togglePrefilter(self):
+        """emits a signal for toggling the removal of interference before finding contours
+        """
+        self.togglePrefilter_Signal.emit()
+
     def reqClose(self):
         """requests closing of the settings view
         """